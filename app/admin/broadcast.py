@@ -3,11 +3,13 @@
 import asyncio
 from typing import Optional, List
 
+import aiosqlite
 from fastapi import APIRouter, Request, Form, Depends, Cookie
 from fastapi.responses import HTMLResponse, RedirectResponse
 from fastapi.templating import Jinja2Templates
 
 from app.admin.auth import get_current_session
+from app.admin.dependencies import get_read_db
 from app.db.connection import get_connection
 from app.utils.logger import logger
 from app.utils.timezone import get_current_time_msk
@@ -91,7 +93,8 @@ async def log_broadcast_delivery(
 @router.get('', response_class=HTMLResponse)
 async def broadcast_page(
     request: Request,
-    session: dict = Depends(get_current_session)
+    session: dict = Depends(get_current_session),
+    conn: aiosqlite.Connection = Depends(get_read_db)
 ):
     """
     Display broadcast form page.
@@ -103,67 +106,63 @@ async def broadcast_page(
     Returns:
         Rendered broadcast.html template
     """
-    conn = await get_connection()
-    try:
-        # Get all directions grouped by course
-        cursor = await conn.execute(
-            """
-            SELECT d.id, d.name, d.course, COUNT(u.id) as user_count
-            FROM directions d
-            LEFT JOIN users u ON u.direction_id = d.id 
-                AND (u.paused_until IS NULL OR u.paused_until < datetime('now'))
-            GROUP BY d.id
-            ORDER BY d.course, d.name
-            """
-        )
-        rows = await cursor.fetchall()
-        
-        directions_by_course = {}
-        for row in rows:
-            course = row[2]
-            if course not in directions_by_course:
-                directions_by_course[course] = []
-            directions_by_course[course].append({
-                'id': row[0],
-                'name': row[1],
-                'user_count': row[3]
-            })
-        
-        # Get total active users count
-        cursor = await conn.execute(
-            """
-            SELECT COUNT(*) FROM users
-            WHERE paused_until IS NULL OR paused_until < datetime('now')
-            """
-        )
-        row = await cursor.fetchone()
-        total_users = row[0] if row else 0
-        
-        # Get user counts by course
-        cursor = await conn.execute(
-            """
-            SELECT d.course, COUNT(u.id) as count
-            FROM users u
-            JOIN directions d ON u.direction_id = d.id
-            WHERE u.paused_until IS NULL OR u.paused_until < datetime('now')
-            GROUP BY d.course
-            """
-        )
-        rows = await cursor.fetchall()
-        users_by_course = {row[0]: row[1] for row in rows}
-        
-        return templates.TemplateResponse(
-            'broadcast.html',
-            {
-                'request': request,
-                'username': session.get('username', 'admin'),
-                'directions_by_course': directions_by_course,
-                'total_users': total_users,
-                'users_by_course': users_by_course
-            }
-        )
-    finally:
-        await conn.close()
+    # Get all directions grouped by course
+    cursor = await conn.execute(
+        """
+        SELECT d.id, d.name, d.course, COUNT(u.id) as user_count
+        FROM directions d
+        LEFT JOIN users u ON u.direction_id = d.id 
+            AND (u.paused_until IS NULL OR u.paused_until < datetime('now'))
+        GROUP BY d.id
+        ORDER BY d.course, d.name
+        """
+    )
+    rows = await cursor.fetchall()
+    
+    directions_by_course = {}
+    for row in rows:
+        course = row[2]
+        if course not in directions_by_course:
+            directions_by_course[course] = []
+        directions_by_course[course].append({
+            'id': row[0],
+            'name': row[1],
+            'user_count': row[3]
+        })
+    
+    # Get total active users count
+    cursor = await conn.execute(
+        """
+        SELECT COUNT(*) FROM users
+        WHERE paused_until IS NULL OR paused_until < datetime('now')
+        """
+    )
+    row = await cursor.fetchone()
+    total_users = row[0] if row else 0
+    
+    # Get user counts by course
+    cursor = await conn.execute(
+        """
+        SELECT d.course, COUNT(u.id) as count
+        FROM users u
+        JOIN directions d ON u.direction_id = d.id
+        WHERE u.paused_until IS NULL OR u.paused_until < datetime('now')
+        GROUP BY d.course
+        """
+    )
+    rows = await cursor.fetchall()
+    users_by_course = {row[0]: row[1] for row in rows}
+    
+    return templates.TemplateResponse(
+        'broadcast.html',
+        {
+            'request': request,
+            'username': session.get('username', 'admin'),
+            'directions_by_course': directions_by_course,
+            'total_users': total_users,
+            'users_by_course': users_by_course
+        }
+    )
 
 
 @router.post('/send', response_class=HTMLResponse)
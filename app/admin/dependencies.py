@@ -0,0 +1,48 @@
+"""Admin panel FastAPI dependencies."""
+
+from contextlib import asynccontextmanager
+from typing import AsyncContextManager, AsyncIterator
+
+import aiosqlite
+
+from app.db import is_postgres, pool
+from app.db.connection import get_connection
+
+
+@asynccontextmanager
+async def _borrow_connection(read_only: bool) -> AsyncIterator[aiosqlite.Connection]:
+    """Borrow one connection for the duration of the block."""
+    if is_postgres():
+        # Admin queries are written for SQLite (see app.db.connection),
+        # so they keep a private connection instead of the asyncpg pool
+        conn = await get_connection()
+        try:
+            yield conn
+        finally:
+            await conn.close()
+        return
+
+    async with pool.acquire(read_only=read_only) as conn:
+        try:
+            yield conn
+        finally:
+            # Never hand a half-finished write to the next request
+            if conn.in_transaction:
+                await conn.rollback()
+
+
+def write_connection() -> AsyncContextManager[aiosqlite.Connection]:
+    """
+    Read-write connection (pooled writer) for one block of writes.
+    
+    There is a single writer, so routes take it only around their
+    statements and commit inside the block, rather than holding it for
+    the whole request.
+    """
+    return _borrow_connection(read_only=False)
+
+
+async def get_read_db() -> AsyncIterator[aiosqlite.Connection]:
+    """Request-scoped read-only connection for pages that only SELECT."""
+    async with _borrow_connection(read_only=True) as conn:
+        yield conn
@@ -1,12 +1,14 @@
 """Admin directions management routes."""
 
 from typing import Optional
+import aiosqlite
 from fastapi import APIRouter, Request, Form, Depends
 from fastapi.responses import HTMLResponse, RedirectResponse
 from fastapi.templating import Jinja2Templates
 
 from app.admin.auth import get_current_session
-from app.db.connection import get_connection
+from app.admin.dependencies import get_read_db, write_connection
+from app.cache.directions import invalidate_directions
 from app.utils.logger import logger
 
 router = APIRouter(prefix='/admin/directions', tags=['admin_directions'])
@@ -17,43 +19,40 @@ templates = Jinja2Templates(directory='templates')
 async def directions_list(
     request: Request,
     session: dict = Depends(get_current_session),
-    course: Optional[str] = None
+    course: Optional[str] = None,
+    conn: aiosqlite.Connection = Depends(get_read_db)
 ):
     """Display list of all directions with optional course filter."""
     # Convert course to int if provided
     course_int: Optional[int] = int(course) if course and course.strip() else None
     
-    conn = await get_connection()
-    try:
-        # Get all directions with user counts
-        if course_int:
-            cursor = await conn.execute(
-                """
-                SELECT d.id, d.name, d.course, 
-                       (SELECT COUNT(*) FROM users WHERE direction_id = d.id) as user_count
-                FROM directions d
-                WHERE d.course = ?
-                ORDER BY d.course, d.name
-                """,
-                (course_int,)
-            )
-        else:
-            cursor = await conn.execute(
-                """
-                SELECT d.id, d.name, d.course, 
-                       (SELECT COUNT(*) FROM users WHERE direction_id = d.id) as user_count
-                FROM directions d
-                ORDER BY d.course, d.name
-                """
-            )
-        
-        rows = await cursor.fetchall()
-        directions = [
-            {'id': r[0], 'name': r[1], 'course': r[2], 'user_count': r[3]}
-            for r in rows
-        ]
-    finally:
-        await conn.close()
+    # Get all directions with user counts
+    if course_int:
+        cursor = await conn.execute(
+            """
+            SELECT d.id, d.name, d.course, 
+                   (SELECT COUNT(*) FROM users WHERE direction_id = d.id) as user_count
+            FROM directions d
+            WHERE d.course = ?
+            ORDER BY d.course, d.name
+            """,
+            (course_int,)
+        )
+    else:
+        cursor = await conn.execute(
+            """
+            SELECT d.id, d.name, d.course, 
+                   (SELECT COUNT(*) FROM users WHERE direction_id = d.id) as user_count
+            FROM directions d
+            ORDER BY d.course, d.name
+            """
+        )
+    
+    rows = await cursor.fetchall()
+    directions = [
+        {'id': r[0], 'name': r[1], 'course': r[2], 'user_count': r[3]}
+        for r in rows
+    ]
     
     return templates.TemplateResponse(
         'directions_list.html',
@@ -91,19 +90,18 @@ async def direction_create(
     course: int = Form(...)
 ):
     """Create new direction."""
-    conn = await get_connection()
-    try:
-        await conn.execute(
-            "INSERT INTO directions (name, course) VALUES (?, ?)",
-            (name, course)
-        )
-        await conn.commit()
-        logger.info(f"Created direction: {name} (course {course})")
-    except Exception as e:
-        logger.error(f"Failed to create direction: {e}")
-        # Likely duplicate
-    finally:
-        await conn.close()
+    async with write_connection() as conn:
+        try:
+            await conn.execute(
+                "INSERT INTO directions (name, course) VALUES (?, ?)",
+                (name, course)
+            )
+            await conn.commit()
+            invalidate_directions()
+            logger.info(f"Created direction: {name} (course {course})")
+        except Exception as e:
+            logger.error(f"Failed to create direction: {e}")
+            # Likely duplicate
     
     return RedirectResponse(url='/admin/directions', status_code=303)
 
@@ -112,23 +110,20 @@ async def direction_create(
 async def direction_edit_form(
     request: Request,
     direction_id: int,
-    session: dict = Depends(get_current_session)
+    session: dict = Depends(get_current_session),
+    conn: aiosqlite.Connection = Depends(get_read_db)
 ):
     """Display form for editing direction."""
-    conn = await get_connection()
-    try:
-        cursor = await conn.execute(
-            "SELECT id, name, course FROM directions WHERE id = ?",
-            (direction_id,)
-        )
-        row = await cursor.fetchone()
-        
-        if not row:
-            return RedirectResponse(url='/admin/directions', status_code=303)
-        
-        direction = {'id': row[0], 'name': row[1], 'course': row[2]}
-    finally:
-        await conn.close()
+    cursor = await conn.execute(
+        "SELECT id, name, course FROM directions WHERE id = ?",
+        (direction_id,)
+    )
+    row = await cursor.fetchone()
+    
+    if not row:
+        return RedirectResponse(url='/admin/directions', status_code=303)
+    
+    direction = {'id': row[0], 'name': row[1], 'course': row[2]}
     
     return templates.TemplateResponse(
         'direction_form.html',
@@ -150,16 +145,14 @@ async def direction_update(
     course: int = Form(...)
 ):
     """Update direction."""
-    conn = await get_connection()
-    try:
+    async with write_connection() as conn:
         await conn.execute(
             "UPDATE directions SET name = ?, course = ? WHERE id = ?",
             (name, course, direction_id)
         )
         await conn.commit()
-        logger.info(f"Updated direction #{direction_id}: {name}")
-    finally:
-        await conn.close()
+        invalidate_directions()
+    logger.info(f"Updated direction #{direction_id}: {name}")
     
     return RedirectResponse(url='/admin/directions', status_code=303)
 
@@ -171,8 +164,7 @@ async def direction_delete(
     session: dict = Depends(get_current_session)
 ):
     """Delete direction (only if no users assigned)."""
-    conn = await get_connection()
-    try:
+    async with write_connection() as conn:
         # Check if there are users with this direction
         cursor = await conn.execute(
             "SELECT COUNT(*) FROM users WHERE direction_id = ?",
@@ -194,8 +186,7 @@ async def direction_delete(
                 (direction_id,)
             )
             await conn.commit()
+            invalidate_directions()
             logger.info(f"Deleted direction #{direction_id}")
-    finally:
-        await conn.close()
     
     return RedirectResponse(url='/admin/directions', status_code=303)
@@ -1,16 +1,18 @@
 """Admin pairs management routes."""
 
 from typing import Optional
+import aiosqlite
 from fastapi import APIRouter, Request, Form, Depends
 from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse
 from fastapi.templating import Jinja2Templates
 
 from app.admin.auth import get_current_session
-from app.db.connection import get_connection
+from app.admin.dependencies import get_read_db, write_connection
 from app.db.queries import (
     get_all_pairs,
     get_all_directions,
     get_pair_by_id,
+    get_pair_with_directions,
     create_pair,
     update_pair,
     delete_pair
@@ -28,8 +30,8 @@ async def get_time_slots(conn):
     cursor = await conn.execute(
         "SELECT id, slot_number, start_time, end_time FROM time_slots ORDER BY slot_number"
     )
-    rows = await cursor.fetchall()
-    return [{'id': r[0], 'slot_number': r[1], 'start_time': r[2], 'end_time': r[3]} for r in rows]
+    # Rows resolve slot.start_time in templates via item lookup
+    return await cursor.fetchall()
 
 
 async def save_subject_and_teacher(conn, subject_name: str, teacher_name: str):
@@ -48,27 +50,25 @@ async def save_subject_and_teacher(conn, subject_name: str, teacher_name: str):
 
 
 @router.get('/api/subjects', response_class=JSONResponse)
-async def get_subjects(session: dict = Depends(get_current_session)):
+async def get_subjects(
+    session: dict = Depends(get_current_session),
+    conn: aiosqlite.Connection = Depends(get_read_db)
+):
     """Get all subjects for autocomplete."""
-    conn = await get_connection()
-    try:
-        cursor = await conn.execute("SELECT name FROM subjects ORDER BY name")
-        rows = await cursor.fetchall()
-        return [row[0] for row in rows]
-    finally:
-        await conn.close()
+    cursor = await conn.execute("SELECT name FROM subjects ORDER BY name")
+    rows = await cursor.fetchall()
+    return [row[0] for row in rows]
 
 
 @router.get('/api/teachers', response_class=JSONResponse)
-async def get_teachers(session: dict = Depends(get_current_session)):
+async def get_teachers(
+    session: dict = Depends(get_current_session),
+    conn: aiosqlite.Connection = Depends(get_read_db)
+):
     """Get all teachers for autocomplete."""
-    conn = await get_connection()
-    try:
-        cursor = await conn.execute("SELECT name FROM teachers ORDER BY name")
-        rows = await cursor.fetchall()
-        return [row[0] for row in rows]
-    finally:
-        await conn.close()
+    cursor = await conn.execute("SELECT name FROM teachers ORDER BY name")
+    rows = await cursor.fetchall()
+    return [row[0] for row in rows]
 
 
 @router.get('', response_class=HTMLResponse)
@@ -77,7 +77,8 @@ async def pairs_list(
     session: dict = Depends(get_current_session),
     direction_id: Optional[str] = None,
     weekday: Optional[str] = None,
-    page: int = 1
+    page: int = 1,
+    conn: aiosqlite.Connection = Depends(get_read_db)
 ):
     """
     Display list of all pairs with filters.
@@ -95,78 +96,74 @@ async def pairs_list(
     direction_id_int: Optional[int] = int(direction_id) if direction_id and direction_id.strip() else None
     weekday_int: Optional[int] = int(weekday) if weekday and weekday.strip() else None
     
-    conn = await get_connection()
-    try:
-        # Get all pairs
-        cursor = await conn.execute(
-            """
-            SELECT 
-                p.id,
-                p.title,
-                p.teacher,
-                p.room,
-                p.type,
-                p.day_of_week,
-                ts.start_time,
-                ts.end_time,
-                ts.slot_number,
-                GROUP_CONCAT(d.name, ', ') as directions
-            FROM pairs p
-            JOIN time_slots ts ON p.time_slot_id = ts.id
-            LEFT JOIN pair_assignments pa ON p.id = pa.pair_id
-            LEFT JOIN directions d ON pa.direction_id = d.id
-            GROUP BY p.id
-            ORDER BY p.day_of_week, ts.slot_number
-            """
-        )
-        all_pairs = await cursor.fetchall()
-        
-        # Apply filters
-        pairs = []
-        for row in all_pairs:
-            # Filter by direction
-            if direction_id_int is not None:
-                cursor = await conn.execute(
-                    """
-                    SELECT COUNT(*) FROM pair_assignments
-                    WHERE pair_id = ? AND direction_id = ?
-                    """,
-                    (row[0], direction_id_int)
-                )
-                count = (await cursor.fetchone())[0]
-                if count == 0:
-                    continue
-            
-            # Filter by weekday
-            if weekday_int is not None and row[5] != weekday_int:
+    # Get all pairs
+    cursor = await conn.execute(
+        """
+        SELECT 
+            p.id,
+            p.title,
+            p.teacher,
+            p.room,
+            p.type,
+            p.day_of_week,
+            ts.start_time,
+            ts.end_time,
+            ts.slot_number,
+            GROUP_CONCAT(d.name, ', ') as directions
+        FROM pairs p
+        JOIN time_slots ts ON p.time_slot_id = ts.id
+        LEFT JOIN pair_assignments pa ON p.id = pa.pair_id
+        LEFT JOIN directions d ON pa.direction_id = d.id
+        GROUP BY p.id
+        ORDER BY p.day_of_week, ts.slot_number
+        """
+    )
+    all_pairs = await cursor.fetchall()
+    
+    # Apply filters
+    pairs = []
+    for row in all_pairs:
+        # Filter by direction
+        if direction_id_int is not None:
+            cursor = await conn.execute(
+                """
+                SELECT COUNT(*) FROM pair_assignments
+                WHERE pair_id = ? AND direction_id = ?
+                """,
+                (row[0], direction_id_int)
+            )
+            count = (await cursor.fetchone())[0]
+            if count == 0:
                 continue
-            
-            pairs.append({
-                'id': row[0],
-                'subject_name': row[1],
-                'teacher_name': row[2],
-                'room': row[3],
-                'pair_type': row[4],
-                'day_of_week': row[5],
-                'start_time': row[6],
-                'end_time': row[7],
-                'slot_number': row[8],
-                'directions': row[9] or 'Нет назначений'
-            })
         
-        # Pagination
-        per_page = 20
-        total_pages = (len(pairs) + per_page - 1) // per_page
-        start_idx = (page - 1) * per_page
-        end_idx = start_idx + per_page
-        paginated_pairs = pairs[start_idx:end_idx]
+        # Filter by weekday
+        if weekday_int is not None and row[5] != weekday_int:
+            continue
         
-        # Get all directions for filter dropdown
-        directions_raw = await get_all_directions(conn)
-        # Convert to list of dicts for template
-        directions = [{'id': d.id, 'name': d.name, 'course': d.course} for d in directions_raw]
-    finally:
-        await conn.close()
+        pairs.append({
+            'id': row[0],
+            'subject_name': row[1],
+            'teacher_name': row[2],
+            'room': row[3],
+            'pair_type': row[4],
+            'day_of_week': row[5],
+            'start_time': row[6],
+            'end_time': row[7],
+            'slot_number': row[8],
+            'directions': row[9] or 'Нет назначений'
+        })
+    
+    # Pagination
+    per_page = 20
+    total_pages = (len(pairs) + per_page - 1) // per_page
+    start_idx = (page - 1) * per_page
+    end_idx = start_idx + per_page
+    paginated_pairs = pairs[start_idx:end_idx]
+    
+    # Get all directions for filter dropdown
+    directions_raw = await get_all_directions(conn)
+    # Convert to list of dicts for template
+    directions = [{'id': d.id, 'name': d.name, 'course': d.course} for d in directions_raw]
     
     weekday_names = [
         'Понедельник', 'Вторник', 'Среда', 'Четверг',
@@ -194,7 +191,8 @@ async def pairs_list(
 @router.get('/new', response_class=HTMLResponse)
 async def pair_new_form(
     request: Request,
-    session: dict = Depends(get_current_session)
+    session: dict = Depends(get_current_session),
+    conn: aiosqlite.Connection = Depends(get_read_db)
 ):
     """
     Display form for creating new pair.
@@ -205,27 +203,23 @@ async def pair_new_form(
     Returns:
         Rendered pair_form.html template
     """
-    conn = await get_connection()
-    try:
-        # Get all directions grouped by course
-        directions = await get_all_directions(conn)
-        directions_by_course = {}
-        for direction in directions:
-            # Direction is a Pydantic model, access attributes with dot notation
-            course = direction.course
-            if course not in directions_by_course:
-                directions_by_course[course] = []
-            # Convert to dict for template
-            directions_by_course[course].append({
-                'id': direction.id,
-                'name': direction.name,
-                'course': direction.course
-            })
-        
-        # Get time slots
-        time_slots = await get_time_slots(conn)
-    finally:
-        await conn.close()
+    # Get all directions grouped by course
+    directions = await get_all_directions(conn)
+    directions_by_course = {}
+    for direction in directions:
+        # Direction is a Pydantic model, access attributes with dot notation
+        course = direction.course
+        if course not in directions_by_course:
+            directions_by_course[course] = []
+        # Convert to dict for template
+        directions_by_course[course].append({
+            'id': direction.id,
+            'name': direction.name,
+            'course': direction.course
+        })
+    
+    # Get time slots
+    time_slots = await get_time_slots(conn)
     
     return templates.TemplateResponse(
         'pair_form.html',
@@ -273,8 +267,7 @@ async def pair_create(
     Returns:
         Redirect to pairs list
     """
-    conn = await get_connection()
-    try:
+    async with write_connection() as conn:
         # Create pair directly (without using PairCreate model for now)
         cursor = await conn.execute(
             """
@@ -286,20 +279,17 @@ async def pair_create(
         pair_id = cursor.lastrowid
         
         # Create pair assignments
-        for direction_id in direction_ids:
-            await conn.execute(
-                "INSERT INTO pair_assignments (pair_id, direction_id) VALUES (?, ?)",
-                (pair_id, direction_id)
-            )
+        await conn.executemany(
+            "INSERT INTO pair_assignments (pair_id, direction_id) VALUES (?, ?)",
+            [(pair_id, direction_id) for direction_id in direction_ids]
+        )
         
         # Save subject and teacher for autocomplete
         await save_subject_and_teacher(conn, subject_name, teacher_name)
         
         await conn.commit()
-        
-        logger.info(f"Created pair #{pair_id}: {subject_name} for {len(direction_ids)} directions")
-    finally:
-        await conn.close()
+    
+    logger.info(f"Created pair #{pair_id}: {subject_name} for {len(direction_ids)} directions")
     
     return RedirectResponse(url='/admin/pairs', status_code=303)
 
@@ -308,7 +298,8 @@ async def pair_create(
 async def pair_edit_form(
     request: Request,
     pair_id: int,
-    session: dict = Depends(get_current_session)
+    session: dict = Depends(get_current_session),
+    conn: aiosqlite.Connection = Depends(get_read_db)
 ):
     """
     Display form for editing existing pair.
@@ -320,61 +311,41 @@ async def pair_edit_form(
     Returns:
         Rendered pair_form.html template with pair data
     """
-    conn = await get_connection()
-    try:
-        # Get pair data
-        cursor = await conn.execute(
-            """
-            SELECT 
-                id, title, teacher, room, type,
-                time_slot_id, day_of_week, extra_link
-            FROM pairs
-            WHERE id = ?
-            """,
-            (pair_id,)
-        )
-        pair_row = await cursor.fetchone()
-        
-        if not pair_row:
-            return RedirectResponse(url='/admin/pairs', status_code=303)
-        
-        pair = {
-            'id': pair_row[0],
-            'subject_name': pair_row[1],
-            'teacher_name': pair_row[2],
-            'room': pair_row[3],
-            'pair_type': pair_row[4],
-            'time_slot_id': pair_row[5],
-            'day_of_week': pair_row[6],
-            'extra_link': pair_row[7]
-        }
-        
-        # Get assigned directions
-        cursor = await conn.execute(
-            "SELECT direction_id FROM pair_assignments WHERE pair_id = ?",
-            (pair_id,)
-        )
-        selected_directions = [row[0] for row in await cursor.fetchall()]
-        
-        # Get all directions grouped by course
-        directions = await get_all_directions(conn)
-        directions_by_course = {}
-        for direction in directions:
-            # Direction is a Pydantic model, access attributes with dot notation
-            course = direction.course
-            if course not in directions_by_course:
-                directions_by_course[course] = []
-            # Convert to dict for template
-            directions_by_course[course].append({
-                'id': direction.id,
-                'name': direction.name,
-                'course': direction.course
-            })
-        
-        # Get time slots
-        time_slots = await get_time_slots(conn)
-    finally:
-        await conn.close()
+    # Get pair data with assigned directions
+    found = await get_pair_with_directions(conn, pair_id)
+    
+    if not found:
+        return RedirectResponse(url='/admin/pairs', status_code=303)
+    
+    pair_model, selected_directions = found
+    pair = {
+        'id': pair_model.id,
+        'subject_name': pair_model.title,
+        'teacher_name': pair_model.teacher,
+        'room': pair_model.room,
+        'pair_type': pair_model.type,
+        'time_slot_id': pair_model.time_slot_id,
+        'day_of_week': pair_model.day_of_week,
+        'extra_link': pair_model.extra_link
+    }
+    
+    # Get all directions grouped by course
+    directions = await get_all_directions(conn)
+    directions_by_course = {}
+    for direction in directions:
+        # Direction is a Pydantic model, access attributes with dot notation
+        course = direction.course
+        if course not in directions_by_course:
+            directions_by_course[course] = []
+        # Convert to dict for template
+        directions_by_course[course].append({
+            'id': direction.id,
+            'name': direction.name,
+            'course': direction.course
+        })
+    
+    # Get time slots
+    time_slots = await get_time_slots(conn)
     
     return templates.TemplateResponse(
         'pair_form.html',
@@ -424,8 +395,7 @@ async def pair_update(
     Returns:
         Redirect to pairs list
     """
-    conn = await get_connection()
-    try:
+    async with write_connection() as conn:
         # Update pair
         await conn.execute(
             """
@@ -446,20 +416,17 @@ async def pair_update(
         )
         
         # Create new assignments
-        for direction_id in direction_ids:
-            await conn.execute(
-                "INSERT INTO pair_assignments (pair_id, direction_id) VALUES (?, ?)",
-                (pair_id, direction_id)
-            )
+        await conn.executemany(
+            "INSERT INTO pair_assignments (pair_id, direction_id) VALUES (?, ?)",
+            [(pair_id, direction_id) for direction_id in direction_ids]
+        )
         
         # Save subject and teacher for autocomplete
         await save_subject_and_teacher(conn, subject_name, teacher_name)
         
         await conn.commit()
-        
-        logger.info(f"Updated pair #{pair_id}: {subject_name}")
-    finally:
-        await conn.close()
+    
+    logger.info(f"Updated pair #{pair_id}: {subject_name}")
     
     return RedirectResponse(url='/admin/pairs', status_code=303)
 
@@ -480,8 +447,7 @@ async def pair_delete(
     Returns:
         Redirect to pairs list
     """
-    conn = await get_connection()
-    try:
+    async with write_connection() as conn:
         # Delete pair assignments first (due to foreign key)
         await conn.execute(
             "DELETE FROM pair_assignments WHERE pair_id = ?",
@@ -493,9 +459,7 @@ async def pair_delete(
             (pair_id,)
         )
         await conn.commit()
-        
-        logger.info(f"Deleted pair #{pair_id}")
-    finally:
-        await conn.close()
+    
+    logger.info(f"Deleted pair #{pair_id}")
     
     return RedirectResponse(url='/admin/pairs', status_code=303)
@@ -3,6 +3,7 @@
 from datetime import datetime
 from typing import Optional
 
+import aiosqlite
 from fastapi import APIRouter, Request, Form, Depends, Cookie
 from fastapi.responses import HTMLResponse, RedirectResponse, Response
 from fastapi.templating import Jinja2Templates
@@ -14,7 +15,7 @@ from app.admin.auth import (
     get_session,
     get_current_session
 )
-from app.db.connection import get_connection
+from app.admin.dependencies import get_read_db
 from app.utils.logger import logger
 from app.utils.timezone import get_current_time_msk
 
@@ -122,7 +123,8 @@ async def logout(session_id: Optional[str] = Cookie(None)):
 @router.get('/dashboard', response_class=HTMLResponse)
 async def dashboard(
     request: Request,
-    session: dict = Depends(get_current_session)
+    session: dict = Depends(get_current_session),
+    conn: aiosqlite.Connection = Depends(get_read_db)
 ):
     """
     Display admin dashboard with statistics.
@@ -134,100 +136,96 @@ async def dashboard(
     Returns:
         Rendered dashboard.html template
     """
-    conn = await get_connection()
-    try:
-        # Get total users
-        cursor = await conn.execute(
-            "SELECT COUNT(*) as count FROM users"
-        )
-        row = await cursor.fetchone()
-        total_users = row[0] if row else 0
-        
-        # Get total pairs
-        cursor = await conn.execute(
-            "SELECT COUNT(*) as count FROM pairs"
-        )
-        row = await cursor.fetchone()
-        total_pairs = row[0] if row else 0
-        
-        # Get messages sent today
-        today_start = get_current_time_msk().replace(
-            hour=0, minute=0, second=0, microsecond=0
-        )
-        cursor = await conn.execute(
-            """
-            SELECT COUNT(*) as count FROM delivery_log
-            WHERE delivered_at >= ?
-            """,
-            (today_start.isoformat(),)
-        )
-        row = await cursor.fetchone()
-        messages_today = row[0] if row else 0
-        
-        # Calculate error rate today
-        cursor = await conn.execute(
-            """
-            SELECT 
-                COUNT(*) as total,
-                SUM(CASE WHEN status = 'error' THEN 1 ELSE 0 END) as errors
-            FROM delivery_log
-            WHERE delivered_at >= ?
-            """,
-            (today_start.isoformat(),)
-        )
-        row = await cursor.fetchone()
-        if row and row[0] > 0:
-            error_rate = ((row[1] or 0) / row[0]) * 100
-        else:
-            error_rate = 0.0
-        
-        # Get recent delivery logs (last 50)
-        cursor = await conn.execute(
-            """
-            SELECT 
-                dl.delivered_at,
-                dl.message_type,
-                u.name,
-                dl.status,
-                dl.error_message
-            FROM delivery_log dl
-            LEFT JOIN users u ON dl.user_id = u.id
-            ORDER BY dl.delivered_at DESC
-            LIMIT 50
-            """
-        )
-        rows = await cursor.fetchall()
-        
-        # Format delivery logs
-        delivery_logs = []
-        for row in rows:
-            try:
-                delivery_time = datetime.fromisoformat(row[0]).strftime('%Y-%m-%d %H:%M:%S')
-            except (ValueError, TypeError):
-                delivery_time = str(row[0]) if row[0] else 'N/A'
-            
-            delivery_logs.append({
-                'delivery_time': delivery_time,
-                'message_type': row[1],
-                'username': row[2] or 'N/A',
-                'success': row[3] == 'sent',
-                'error_message': row[4]
-            })
+    # Get total users
+    cursor = await conn.execute(
+        "SELECT COUNT(*) as count FROM users"
+    )
+    row = await cursor.fetchone()
+    total_users = row[0] if row else 0
+    
+    # Get total pairs
+    cursor = await conn.execute(
+        "SELECT COUNT(*) as count FROM pairs"
+    )
+    row = await cursor.fetchone()
+    total_pairs = row[0] if row else 0
+    
+    # Get messages sent today
+    today_start = get_current_time_msk().replace(
+        hour=0, minute=0, second=0, microsecond=0
+    )
+    cursor = await conn.execute(
+        """
+        SELECT COUNT(*) as count FROM delivery_log
+        WHERE delivered_at >= ?
+        """,
+        (today_start.isoformat(),)
+    )
+    row = await cursor.fetchone()
+    messages_today = row[0] if row else 0
+    
+    # Calculate error rate today
+    cursor = await conn.execute(
+        """
+        SELECT 
+            COUNT(*) as total,
+            SUM(CASE WHEN status = 'error' THEN 1 ELSE 0 END) as errors
+        FROM delivery_log
+        WHERE delivered_at >= ?
+        """,
+        (today_start.isoformat(),)
+    )
+    row = await cursor.fetchone()
+    if row and row[0] > 0:
+        error_rate = ((row[1] or 0) / row[0]) * 100
+    else:
+        error_rate = 0.0
+    
+    # Get recent delivery logs (last 50)
+    cursor = await conn.execute(
+        """
+        SELECT 
+            dl.delivered_at,
+            dl.message_type,
+            u.name,
+            dl.status,
+            dl.error_message
+        FROM delivery_log dl
+        LEFT JOIN users u ON dl.user_id = u.id
+        ORDER BY dl.delivered_at DESC
+        LIMIT 50
+        """
+    )
+    rows = await cursor.fetchall()
+    
+    # Format delivery logs
+    delivery_logs = []
+    for row in rows:
+        try:
+            delivery_time = datetime.fromisoformat(row[0]).strftime('%Y-%m-%d %H:%M:%S')
+        except (ValueError, TypeError):
+            delivery_time = str(row[0]) if row[0] else 'N/A'
         
-        # Render dashboard template
-        return templates.TemplateResponse(
-            'dashboard.html',
-            {
-                'request': request,
-                'username': session.get('username', 'admin'),
-                'stats': {
-                    'total_users': total_users,
-                    'total_pairs': total_pairs,
-                    'messages_today': messages_today,
-                    'error_rate': f"{error_rate:.2f}%"
-                },
-                'delivery_logs': delivery_logs
-            }
-        )
-    finally:
-        await conn.close()
+        delivery_logs.append({
+            'delivery_time': delivery_time,
+            'message_type': row[1],
+            'username': row[2] or 'N/A',
+            'success': row[3] == 'sent',
+            'error_message': row[4]
+        })
+    
+    # Render dashboard template
+    return templates.TemplateResponse(
+        'dashboard.html',
+        {
+            'request': request,
+            'username': session.get('username', 'admin'),
+            'stats': {
+                'total_users': total_users,
+                'total_pairs': total_pairs,
+                'messages_today': messages_today,
+                'error_rate': f"{error_rate:.2f}%"
+            },
+            'delivery_logs': delivery_logs
+        }
+    )
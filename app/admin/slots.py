@@ -1,11 +1,12 @@
 """Admin time slots management routes."""
 
+import aiosqlite
 from fastapi import APIRouter, Request, Form, Depends
 from fastapi.responses import HTMLResponse, RedirectResponse
 from fastapi.templating import Jinja2Templates
 
 from app.admin.auth import get_current_session
-from app.db.connection import get_connection
+from app.admin.dependencies import get_read_db, write_connection
 from app.utils.logger import logger
 
 router = APIRouter(prefix='/admin/slots', tags=['admin_slots'])
@@ -15,32 +16,29 @@ templates = Jinja2Templates(directory='templates')
 @router.get('', response_class=HTMLResponse)
 async def slots_list(
     request: Request,
-    session: dict = Depends(get_current_session)
+    session: dict = Depends(get_current_session),
+    conn: aiosqlite.Connection = Depends(get_read_db)
 ):
     """Display list of all time slots."""
-    conn = await get_connection()
-    try:
-        cursor = await conn.execute(
-            """
-            SELECT ts.id, ts.slot_number, ts.start_time, ts.end_time,
-                   (SELECT COUNT(*) FROM pairs WHERE time_slot_id = ts.id) as pair_count
-            FROM time_slots ts
-            ORDER BY ts.slot_number
-            """
-        )
-        rows = await cursor.fetchall()
-        slots = [
-            {
-                'id': r[0], 
-                'slot_number': r[1], 
-                'start_time': r[2], 
-                'end_time': r[3],
-                'pair_count': r[4]
-            }
-            for r in rows
-        ]
-    finally:
-        await conn.close()
+    cursor = await conn.execute(
+        """
+        SELECT ts.id, ts.slot_number, ts.start_time, ts.end_time,
+               (SELECT COUNT(*) FROM pairs WHERE time_slot_id = ts.id) as pair_count
+        FROM time_slots ts
+        ORDER BY ts.slot_number
+        """
+    )
+    rows = await cursor.fetchall()
+    slots = [
+        {
+            'id': r[0], 
+            'slot_number': r[1], 
+            'start_time': r[2], 
+            'end_time': r[3],
+            'pair_count': r[4]
+        }
+        for r in rows
+    ]
     
     return templates.TemplateResponse(
         'slots_list.html',
@@ -56,28 +54,25 @@ async def slots_list(
 async def slot_edit_form(
     request: Request,
     slot_id: int,
-    session: dict = Depends(get_current_session)
+    session: dict = Depends(get_current_session),
+    conn: aiosqlite.Connection = Depends(get_read_db)
 ):
     """Display form for editing time slot."""
-    conn = await get_connection()
-    try:
-        cursor = await conn.execute(
-            "SELECT id, slot_number, start_time, end_time FROM time_slots WHERE id = ?",
-            (slot_id,)
-        )
-        row = await cursor.fetchone()
-        
-        if not row:
-            return RedirectResponse(url='/admin/slots', status_code=303)
-        
-        slot = {
-            'id': row[0], 
-            'slot_number': row[1], 
-            'start_time': row[2], 
-            'end_time': row[3]
-        }
-    finally:
-        await conn.close()
+    cursor = await conn.execute(
+        "SELECT id, slot_number, start_time, end_time FROM time_slots WHERE id = ?",
+        (slot_id,)
+    )
+    row = await cursor.fetchone()
+    
+    if not row:
+        return RedirectResponse(url='/admin/slots', status_code=303)
+    
+    slot = {
+        'id': row[0], 
+        'slot_number': row[1], 
+        'start_time': row[2], 
+        'end_time': row[3]
+    }
     
     return templates.TemplateResponse(
         'slot_form.html',
@@ -98,15 +93,12 @@ async def slot_update(
     end_time: str = Form(...)
 ):
     """Update time slot."""
-    conn = await get_connection()
-    try:
+    async with write_connection() as conn:
         await conn.execute(
             "UPDATE time_slots SET start_time = ?, end_time = ? WHERE id = ?",
             (start_time, end_time, slot_id)
         )
         await conn.commit()
-        logger.info(f"Updated time slot #{slot_id}: {start_time} - {end_time}")
-    finally:
-        await conn.close()
+    logger.info(f"Updated time slot #{slot_id}: {start_time} - {end_time}")
     
     return RedirectResponse(url='/admin/slots', status_code=303)
@@ -1,12 +1,18 @@
 """Bot utilities package."""
 
 from .formatters import (
+    NO_CLASSES_MESSAGE,
+    format_schedule_greeting,
+    format_schedule_body,
     format_schedule_message,
     format_reminder_message,
     format_registration_confirmation
 )
 
 __all__ = [
+    'NO_CLASSES_MESSAGE',
+    'format_schedule_greeting',
+    'format_schedule_body',
     'format_schedule_message',
     'format_reminder_message',
     'format_registration_confirmation'
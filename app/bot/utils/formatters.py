@@ -9,40 +9,41 @@ from app.db.models.pair import Pair
 from app.utils.timezone import get_weekday_name_ru
 
 
-def format_schedule_message(
-    pairs: List[Tuple[Pair, str, str]],
-    day_of_week: int,
-    user_name: str
-) -> str:
+# Morning message body for a day without classes (same for every user)
+NO_CLASSES_MESSAGE = "\nСегодня у тебя нет пар. Отдыхай! 😊"
+
+
+def format_schedule_greeting(day_of_week: int, user_name: str) -> str:
     """
-    Format morning schedule message.
+    Format the personal header of the morning schedule message.
     
     Args:
-        pairs: List of (Pair, start_time, end_time)
         day_of_week: Day of week (0=Monday)
         user_name: Student name
     
     Returns:
-        Formatted message text
+        Header text (weekday and greeting)
     """
     weekday_name = get_weekday_name_ru(day_of_week)
-    
-    if not pairs:
-        return f"""
-📅 <b>{weekday_name}</b>
+    return f"📅 <b>{weekday_name}</b>\n\nПривет, {user_name}! 👋\n"
 
-Привет, {user_name}! 👋
 
-Сегодня у тебя нет пар. Отдыхай! 😊
-"""
+def format_schedule_body(pairs: List[Tuple[Pair, str, str]]) -> str:
+    """
+    Format the pair list of the morning schedule message.
     
-    message = f"""
-📅 <b>{weekday_name}</b>
-
-Привет, {user_name}! 👋
-Вот твоё расписание на сегодня:
-
-"""
+    Doesn't depend on the user, so jobs render it once per direction.
+    
+    Args:
+        pairs: List of (Pair, start_time, end_time)
+    
+    Returns:
+        Schedule text following the greeting
+    """
+    if not pairs:
+        return NO_CLASSES_MESSAGE
+    
+    message = "Вот твоё расписание на сегодня:\n\n"
     
     for pair, start_time, end_time in pairs:
         message += f"""
@@ -59,7 +60,26 @@ def format_schedule_message(
     
     message += "Удачного дня! 🎓"
     
-    return message.strip()
+    return message
+
+
+def format_schedule_message(
+    pairs: List[Tuple[Pair, str, str]],
+    day_of_week: int,
+    user_name: str
+) -> str:
+    """
+    Format morning schedule message.
+    
+    Args:
+        pairs: List of (Pair, start_time, end_time)
+        day_of_week: Day of week (0=Monday)
+        user_name: Student name
+    
+    Returns:
+        Formatted message text
+    """
+    return format_schedule_greeting(day_of_week, user_name) + format_schedule_body(pairs)
 
 
 def format_reminder_message(
@@ -0,0 +1,17 @@
+"""In-process caches package."""
+
+from .directions import (
+    DIRECTIONS,
+    get_direction_name,
+    load_directions,
+    invalidate_directions
+)
+from .ttl import async_ttl_cache
+
+__all__ = [
+    'DIRECTIONS',
+    'get_direction_name',
+    'load_directions',
+    'invalidate_directions',
+    'async_ttl_cache'
+]
@@ -0,0 +1,76 @@
+"""
+Direction name cache.
+
+Direction names change only when an admin edits them, yet they are needed
+on every incoming message (user profile, schedule header). Keep an
+id -> name map in memory instead of joining directions on each lookup.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING, Dict, Optional
+
+from app.utils.logger import logger
+
+if TYPE_CHECKING:
+    import aiosqlite
+
+
+# Reload at least this often; the admin panel may run in another process
+CACHE_TTL_SECONDS = 300
+
+DIRECTIONS: Dict[int, str] = {}
+_loaded_at: Optional[float] = None
+
+
+async def load_directions(conn: aiosqlite.Connection):
+    """
+    (Re)load all direction names.
+
+    Args:
+        conn: Database connection
+    """
+    global _loaded_at
+
+    cursor = await conn.execute("SELECT id, name FROM directions")
+    rows = await cursor.fetchall()
+
+    DIRECTIONS.clear()
+    DIRECTIONS.update((row[0], row[1]) for row in rows)
+    _loaded_at = time.monotonic()
+    logger.debug("Loaded %d direction names into cache", len(DIRECTIONS))
+
+
+def invalidate_directions():
+    """Force a reload on next access (call after direction changes)."""
+    global _loaded_at
+    _loaded_at = None
+
+
+async def get_direction_name(
+    conn: aiosqlite.Connection,
+    direction_id: Optional[int]
+) -> Optional[str]:
+    """
+    Get direction name by ID.
+
+    Args:
+        conn: Database connection (used only when the cache is reloaded)
+        direction_id: Direction ID
+
+    Returns:
+        Direction name or None if direction not set or not found
+    """
+    if direction_id is None:
+        return None
+
+    expired = (
+        _loaded_at is None
+        or time.monotonic() - _loaded_at > CACHE_TTL_SECONDS
+    )
+    # Unknown ID may be a direction created since the last load
+    if expired or direction_id not in DIRECTIONS:
+        await load_directions(conn)
+
+    return DIRECTIONS.get(direction_id)
@@ -0,0 +1,70 @@
+"""
+Time-based caching for async functions.
+
+Used for results that many jobs need within a short window and that may be
+a little stale (e.g. the active user list shared by back-to-back scheduler
+jobs).
+"""
+
+import asyncio
+import functools
+import time
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+def async_ttl_cache(ttl: float) -> Callable[[Callable[..., Awaitable[T]]], Callable[..., Awaitable[T]]]:
+    """
+    Cache the result of an async function for `ttl` seconds.
+
+    The cache holds a single value regardless of arguments, so only use it
+    for functions whose arguments don't affect the result (such as the
+    connection to query on). Concurrent callers on a cold cache share one
+    call. The wrapped function gets a `cache_clear()` method for
+    invalidation after writes; a result that was being loaded while it ran
+    is returned to its caller but not cached.
+
+    Args:
+        ttl: Seconds a result stays valid
+    """
+    def decorator(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        value: Any = None
+        expires_at = 0.0
+        # Bumped by cache_clear(), so a load that overlaps a clear isn't stored
+        generation = 0
+        # Created on first use, inside the running event loop
+        lock: Optional[asyncio.Lock] = None
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs) -> T:
+            nonlocal value, expires_at, lock
+
+            if time.monotonic() < expires_at:
+                return value
+
+            if lock is None:
+                lock = asyncio.Lock()
+
+            async with lock:
+                # Another caller may have refreshed it while we waited
+                if time.monotonic() < expires_at:
+                    return value
+
+                started = generation
+                result = await func(*args, **kwargs)
+                if generation == started:
+                    value = result
+                    expires_at = time.monotonic() + ttl
+                return result
+
+        def cache_clear():
+            nonlocal value, expires_at, generation
+            generation += 1
+            value = None
+            expires_at = 0.0
+
+        wrapper.cache_clear = cache_clear
+        return wrapper
+
+    return decorator
@@ -6,6 +6,7 @@ Supports both local development and cloud deployment (Railway, Render).
 """
 
 import os
+from functools import cached_property
 from typing import Optional
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -21,6 +22,14 @@ class Settings(BaseSettings):
     # SQLite for local, PostgreSQL URL for cloud (auto-detected)
     DATABASE_PATH: str = "data/schedule.db"
     DATABASE_URL: Optional[str] = None  # Set by Railway/Render
+    # Connection pool size (SQLite: read-only connections besides the writer)
+    DB_POOL_MIN_SIZE: int = 4
+    DB_POOL_MAX_SIZE: int = 16
+    
+    # === FSM Storage ===
+    # Redis keeps bot conversation state across restarts and workers;
+    # without it state is kept in process memory
+    REDIS_URL: Optional[str] = None
     
     # === Admin Panel ===
     ADMIN_USERNAME: str = "admin"
@@ -34,11 +43,13 @@ class Settings(BaseSettings):
     MORNING_MESSAGE_HOUR: int = 8
     MORNING_MESSAGE_MINUTE: int = 0
     REMINDER_MINUTES_BEFORE: int = 5
+    SCHEDULER_MISFIRE_GRACE_TIME: int = 120  # Seconds a late job may still start
     
     # === Delivery ===
     BATCH_SIZE: int = 30
     BATCH_DELAY: float = 0.2  # seconds between batches
     MAX_RETRIES: int = 1
+    TG_RPS: int = 30  # Max outgoing messages per second (Telegram allows ~30)
     
     # === Logging ===
     LOG_LEVEL: str = "INFO"
@@ -48,6 +59,14 @@ class Settings(BaseSettings):
     WEB_HOST: str = "127.0.0.1"
     WEB_PORT: int = 8000
     
+    # === Webhook ===
+    # Public base URL of the service (e.g. https://bot.up.railway.app).
+    # When set in a cloud deployment, combined mode receives updates via
+    # webhook at WEBHOOK_PATH instead of long polling
+    WEBHOOK_URL: Optional[str] = None
+    WEBHOOK_PATH: str = "/tg/webhook"
+    WEBHOOK_SECRET: Optional[str] = None  # Checked against Telegram's secret token header; random if unset
+    
     # === Cloud Deployment ===
     # These are auto-set by cloud platforms
     PORT: Optional[int] = None  # Railway/Render set this
@@ -64,12 +83,12 @@ class Settings(BaseSettings):
         extra="ignore"  # Ignore extra env vars from cloud platforms
     )
     
-    @property
+    @cached_property
     def is_cloud(self) -> bool:
         """Check if running in cloud environment."""
         return bool(self.DATABASE_URL or self.RAILWAY_ENVIRONMENT or self.RENDER)
     
-    @property
+    @cached_property
     def effective_port(self) -> int:
         """Get the effective port to use."""
         return self.PORT or self.ADMIN_PORT
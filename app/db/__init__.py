@@ -5,31 +5,26 @@ import os
 # Determine which database backend to use
 _use_postgres = bool(os.environ.get('DATABASE_URL'))
 
+# Helper functions resolve to the right backend inside connection_cloud
+from .connection_cloud import (
+    fetch_all,
+    fetch_one,
+    execute,
+    execute_returning,
+    release_connection,
+    transaction,
+    is_postgres,
+    is_postgres_connection
+)
+
 if _use_postgres:
     # Cloud deployment - use PostgreSQL via connection_cloud
-    from .connection_cloud import (
-        get_connection, 
-        init_database,
-        fetch_all,
-        fetch_one,
-        execute,
-        execute_returning,
-        release_connection,
-        is_postgres
-    )
+    from .connection_cloud import get_connection, init_database
 else:
     # Local development - use SQLite
     from .connection import get_connection, init_database
-    
-    # Import helper functions from connection_cloud (SQLite fallback)
-    from .connection_cloud import (
-        fetch_all,
-        fetch_one,
-        execute,
-        execute_returning,
-        release_connection,
-        is_postgres
-    )
+
+from .pool import pool
 
 __all__ = [
     'get_connection', 
@@ -39,5 +34,8 @@ __all__ = [
     'execute',
     'execute_returning',
     'release_connection',
-    'is_postgres'
+    'transaction',
+    'is_postgres',
+    'is_postgres_connection',
+    'pool'
 ]
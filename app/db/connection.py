@@ -4,9 +4,38 @@ Database connection management.
 Provides functions for connecting to SQLite database with proper configuration.
 """
 
-import aiosqlite
+from __future__ import annotations
+
 from pathlib import Path
+from typing import TYPE_CHECKING
 from app.config import settings
+from app.utils.logger import logger
+
+if TYPE_CHECKING:
+    import aiosqlite
+
+# Ensure database directory exists once, not on every connection
+Path(settings.DATABASE_PATH).parent.mkdir(parents=True, exist_ok=True)
+
+# Applied to every new connection:
+# - WAL lets readers run alongside the writer; NORMAL sync is safe under WAL
+# - 64 MB page cache, 256 MB mmap, temp tables in memory
+# - wait up to 5s for a lock instead of failing with "database is locked"
+SQLITE_PRAGMAS = """
+PRAGMA encoding = 'UTF-8';
+PRAGMA foreign_keys = ON;
+PRAGMA journal_mode = WAL;
+PRAGMA synchronous = NORMAL;
+PRAGMA temp_store = MEMORY;
+PRAGMA cache_size = -64000;
+PRAGMA mmap_size = 268435456;
+PRAGMA busy_timeout = 5000;
+"""
+
+# Size of the per-connection prepared statement cache (sqlite3 default: 128).
+# Queries use fixed literal SQL, so on long-lived connections every repeated
+# query is served from the cache instead of being re-parsed by SQLite.
+SQLITE_CACHED_STATEMENTS = 256
 
 
 async def get_connection() -> aiosqlite.Connection:
@@ -16,14 +45,14 @@ async def get_connection() -> aiosqlite.Connection:
     Returns:
         aiosqlite.Connection: Connected database instance
     """
-    # Ensure database directory exists
-    db_path = Path(settings.DATABASE_PATH)
-    db_path.parent.mkdir(parents=True, exist_ok=True)
+    # Imported lazily so cloud (PostgreSQL) deployments never load the driver
+    import aiosqlite
     
-    # Connect with UTF-8 encoding
-    conn = await aiosqlite.connect(settings.DATABASE_PATH)
-    await conn.execute("PRAGMA encoding = 'UTF-8'")
-    await conn.execute("PRAGMA foreign_keys = ON")  # Enable foreign key constraints
+    conn = await aiosqlite.connect(
+        settings.DATABASE_PATH,
+        cached_statements=SQLITE_CACHED_STATEMENTS
+    )
+    await conn.executescript(SQLITE_PRAGMAS)
     conn.row_factory = aiosqlite.Row  # Access rows as dictionaries
     
     return conn
@@ -50,13 +79,14 @@ async def init_database():
         with open(seed_path, 'r', encoding='utf-8') as f:
             seed_sql = f.read()
         
-        await conn.executescript(seed_sql)
+        # One transaction for all seed statements instead of one per INSERT
+        await conn.executescript(f"BEGIN;\n{seed_sql}\nCOMMIT;")
         
         await conn.commit()
-        print("✓ Database initialized successfully")
+        logger.info("✓ Database initialized successfully")
         
     except Exception as e:
-        print(f"✗ Database initialization failed: {e}")
+        logger.error(f"✗ Database initialization failed: {e}")
         raise
     finally:
         await conn.close()
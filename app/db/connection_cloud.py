@@ -10,46 +10,106 @@ from pathlib import Path
 from typing import Union, Optional, Any, List
 from contextlib import asynccontextmanager
 from app.config import settings
+from app.db.sql_dialect import convert_query
 from app.utils.logger import logger
 
 
+# The backend is chosen once, at import; is_postgres() reports that choice
+_USE_POSTGRES = bool(os.environ.get('DATABASE_URL'))
+
+
+# Connection classes that speak PostgreSQL (filled in below in PG mode)
+_POSTGRES_CONNECTION_TYPES: tuple = ()
+
+
 def is_postgres() -> bool:
     """Check if we should use PostgreSQL instead of SQLite."""
-    return bool(os.environ.get('DATABASE_URL'))
+    return _USE_POSTGRES
+
+
+def is_postgres_connection(conn: Any) -> bool:
+    """
+    Check whether a connection talks to PostgreSQL.
+    
+    Query helpers that emit dialect-specific SQL must check the connection
+    they were given rather than is_postgres(): the admin panel keeps using
+    SQLite connections in PostgreSQL mode.
+    
+    Args:
+        conn: Database connection
+    
+    Returns:
+        True for PostgreSQL connections, False for SQLite ones
+    """
+    return isinstance(conn, _POSTGRES_CONNECTION_TYPES)
+
+
+@asynccontextmanager
+async def transaction(conn: Any):
+    """
+    Run a block of statements in one transaction.
+    
+    Picks the implementation from the connection rather than is_postgres(),
+    because the admin panel keeps using SQLite connections in PostgreSQL mode.
+    
+    On PostgreSQL, nested use becomes a savepoint. On SQLite, the write lock
+    is taken up front (BEGIN IMMEDIATE) and the block commits once on exit,
+    rolling back on error; a block nested in another transaction() on the
+    same connection joins it and leaves the commit to the outer block. Any
+    other open transaction is not joined.
+    
+    Args:
+        conn: Database connection
+    """
+    if is_postgres_connection(conn):
+        async with conn._conn.transaction():
+            yield conn
+        return
+    
+    depth = getattr(conn, '_transaction_depth', 0)
+    if depth:
+        conn._transaction_depth = depth + 1
+        try:
+            yield conn
+        finally:
+            conn._transaction_depth = depth
+        return
+    
+    await conn.execute("BEGIN IMMEDIATE")
+    conn._transaction_depth = 1
+    try:
+        yield conn
+    except BaseException:
+        await conn.rollback()
+        raise
+    else:
+        await conn.commit()
+    finally:
+        conn._transaction_depth = 0
 
 
-if is_postgres():
+if _USE_POSTGRES:
     # PostgreSQL mode (cloud deployment)
     import asyncpg
     
     _pool: Optional[asyncpg.Pool] = None
     
-    def convert_query(query: str) -> str:
+    async def _init_connection(conn: asyncpg.Connection):
         """
-        Convert SQLite query syntax to PostgreSQL.
-        - ? placeholders to $1, $2, etc.
-        - datetime('now') to NOW()
-        - AUTOINCREMENT to SERIAL
-        """
-        # Convert ? placeholders
-        result = []
-        param_count = 0
-        i = 0
-        while i < len(query):
-            if query[i] == '?':
-                param_count += 1
-                result.append(f'${param_count}')
-            else:
-                result.append(query[i])
-            i += 1
+        Per-connection setup for the pool.
         
-        query = ''.join(result)
-        
-        # Convert SQLite functions to PostgreSQL
-        query = query.replace("datetime('now')", "NOW()")
-        query = query.replace("AUTOINCREMENT", "")  # PostgreSQL uses SERIAL
-        
-        return query
+        Timestamps are exchanged as text: models store them as ISO strings,
+        so this skips datetime parsing for columns that are rarely read and
+        lets callers pass ISO strings as query parameters.
+        """
+        for type_name in ('timestamp', 'timestamptz'):
+            await conn.set_type_codec(
+                type_name,
+                encoder=str,
+                decoder=str,
+                schema='pg_catalog',
+                format='text'
+            )
     
     async def init_pool():
         """Initialize PostgreSQL connection pool."""
@@ -59,7 +119,12 @@ if is_postgres():
             # Railway/Render use postgres://, asyncpg needs postgresql://
             if database_url and database_url.startswith('postgres://'):
                 database_url = database_url.replace('postgres://', 'postgresql://', 1)
-            _pool = await asyncpg.create_pool(database_url, min_size=2, max_size=10)
+            _pool = await asyncpg.create_pool(
+                database_url,
+                min_size=settings.DB_POOL_MIN_SIZE,
+                max_size=settings.DB_POOL_MAX_SIZE,
+                init=_init_connection
+            )
             logger.info("PostgreSQL connection pool initialized")
         return _pool
     
@@ -68,6 +133,8 @@ if is_postgres():
         Wrapper to make asyncpg connection compatible with aiosqlite interface.
         Allows existing SQLite-based code to work with PostgreSQL.
         """
+        __slots__ = ('_conn', '_in_transaction')
+        
         def __init__(self, conn: asyncpg.Connection):
             self._conn = conn
             self._in_transaction = False
@@ -87,6 +154,12 @@ if is_postgres():
                 result = await self._conn.execute(pg_query, *params)
                 return PostgresCursorWrapper([], result)
         
+        async def executemany(self, query: str, params_seq) -> 'PostgresCursorWrapper':
+            """Execute query once per parameter tuple in a single call."""
+            pg_query = convert_query(query)
+            await self._conn.executemany(pg_query, params_seq)
+            return PostgresCursorWrapper([])
+        
         async def executescript(self, script: str):
             """Execute multiple SQL statements."""
             # Split by ; and execute each statement
@@ -109,6 +182,11 @@ if is_postgres():
             if _pool:
                 await _pool.release(self._conn)
         
+        @property
+        def raw_connection(self) -> asyncpg.Connection:
+            """Underlying asyncpg connection (for COPY and other native APIs)."""
+            return self._conn
+        
         @property
         def row_factory(self):
             """Compatibility property."""
@@ -119,10 +197,14 @@ if is_postgres():
             """Compatibility setter."""
             pass
     
+    _POSTGRES_CONNECTION_TYPES = (PostgresConnectionWrapper,)
+    
     class PostgresCursorWrapper:
         """
         Wrapper to make asyncpg results compatible with aiosqlite cursor.
         """
+        __slots__ = ('_rows', '_result', '_index', '_lastrowid')
+        
         def __init__(self, rows: List[asyncpg.Record], result: str = None):
             self._rows = rows
             self._result = result
@@ -219,7 +301,8 @@ if is_postgres():
             updated_at TIMESTAMP NOT NULL DEFAULT NOW()
         );
         CREATE INDEX IF NOT EXISTS idx_users_tg_id ON users(tg_id);
-        CREATE INDEX IF NOT EXISTS idx_users_direction ON users(direction_id);
+        DROP INDEX IF EXISTS idx_users_direction;
+        CREATE INDEX IF NOT EXISTS idx_users_direction_paused ON users(direction_id, paused_until);
         
         -- Directions table
         CREATE TABLE IF NOT EXISTS directions (
@@ -239,6 +322,7 @@ if is_postgres():
             end_time TEXT NOT NULL,
             created_at TIMESTAMP NOT NULL DEFAULT NOW()
         );
+        CREATE INDEX IF NOT EXISTS idx_time_slots_start ON time_slots(start_time);
         
         -- Pairs table
         CREATE TABLE IF NOT EXISTS pairs (
@@ -253,7 +337,8 @@ if is_postgres():
             created_at TIMESTAMP NOT NULL DEFAULT NOW(),
             updated_at TIMESTAMP NOT NULL DEFAULT NOW()
         );
-        CREATE INDEX IF NOT EXISTS idx_pairs_day ON pairs(day_of_week);
+        DROP INDEX IF EXISTS idx_pairs_day;
+        CREATE INDEX IF NOT EXISTS idx_pairs_dow_slot ON pairs(day_of_week, time_slot_id);
         
         -- Pair assignments table
         CREATE TABLE IF NOT EXISTS pair_assignments (
@@ -263,6 +348,7 @@ if is_postgres():
             created_at TIMESTAMP NOT NULL DEFAULT NOW(),
             UNIQUE(pair_id, direction_id)
         );
+        CREATE INDEX IF NOT EXISTS idx_pa_direction ON pair_assignments(direction_id, pair_id);
         
         -- Delivery log table
         CREATE TABLE IF NOT EXISTS delivery_log (
@@ -336,17 +422,8 @@ else:
     # SQLite mode (local development)
     import aiosqlite
     
-    async def get_connection() -> aiosqlite.Connection:
-        """Get async connection to SQLite database."""
-        db_path = Path(settings.DATABASE_PATH)
-        db_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        conn = await aiosqlite.connect(settings.DATABASE_PATH)
-        await conn.execute("PRAGMA encoding = 'UTF-8'")
-        await conn.execute("PRAGMA foreign_keys = ON")
-        conn.row_factory = aiosqlite.Row
-        
-        return conn
+    # Same connection setup (directory, PRAGMAs, row factory) as app.db.connection
+    from app.db.connection import get_connection
     
     async def fetch_all(query: str, params: tuple = ()) -> List[dict]:
         """Execute query and fetch all results."""
@@ -406,7 +483,8 @@ else:
             if seed_path.exists():
                 with open(seed_path, 'r', encoding='utf-8') as f:
                     seed_sql = f.read()
-                await conn.executescript(seed_sql)
+                # One transaction for all seed statements instead of one per INSERT
+                await conn.executescript(f"BEGIN;\n{seed_sql}\nCOMMIT;")
             
             await conn.commit()
             logger.info("✓ SQLite database initialized")
@@ -9,13 +9,14 @@ Usage:
 
 import asyncio
 from app.db import init_database
+from app.utils.logger import logger
 
 
 async def main():
     """Initialize database."""
-    print("Initializing database...")
+    logger.info("Initializing database...")
     await init_database()
-    print("Done!")
+    logger.info("Done!")
 
 
 if __name__ == "__main__":
@@ -1,11 +1,11 @@
 """Database models package."""
 
-from .user import User, UserCreate
+from .user import User, UserCreate, ActiveUser
 from .direction import Direction, DirectionCreate
 from .pair import Pair, PairCreate
 
 __all__ = [
-    'User', 'UserCreate',
+    'User', 'UserCreate', 'ActiveUser',
     'Direction', 'DirectionCreate',
     'Pair', 'PairCreate'
 ]
@@ -24,6 +24,27 @@ class Pair(BaseModel):
     
     class Config:
         from_attributes = True
+    
+    @classmethod
+    def from_row(cls, row) -> "Pair":
+        """
+        Build from a database row without re-running validation.
+        
+        Rows were validated on write, so model_construct is safe here and
+        much cheaper for list queries. Extra columns in the row are ignored.
+        """
+        return cls.model_construct(
+            id=row['id'],
+            title=row['title'],
+            teacher=row['teacher'],
+            room=row['room'],
+            type=row['type'],
+            day_of_week=row['day_of_week'],
+            time_slot_id=row['time_slot_id'],
+            extra_link=row['extra_link'],
+            created_at=row['created_at'],
+            updated_at=row['updated_at']
+        )
 
 
 class PairCreate(BaseModel):
@@ -5,7 +5,7 @@ Pydantic model for user data structure.
 """
 
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import NamedTuple, Optional
 
 
 class User(BaseModel):
@@ -23,6 +23,51 @@ class User(BaseModel):
     
     class Config:
         from_attributes = True
+    
+    @classmethod
+    def from_row(cls, row) -> "User":
+        """
+        Build from a database row without re-running validation.
+        
+        Rows were validated on write, so model_construct is safe here and
+        much cheaper for list queries. Extra columns in the row are ignored.
+        """
+        return cls.model_construct(
+            id=row['id'],
+            tg_id=row['tg_id'],
+            name=row['name'],
+            course=row['course'],
+            direction_id=row['direction_id'],
+            remind_before=bool(row['remind_before']),  # SQLite stores 0/1
+            paused_until=row['paused_until'],
+            created_at=row['created_at'],
+            updated_at=row['updated_at']
+        )
+
+
+class ActiveUser(NamedTuple):
+    """
+    Compact read-only user record for scheduler jobs.
+    
+    Pydantic models keep a per-instance __dict__; jobs hold thousands of
+    users (and the list is cached), so they use this tuple with just the
+    fields they read.
+    """
+    
+    tg_id: int
+    name: str
+    direction_id: int
+    remind_before: bool
+    
+    @classmethod
+    def from_row(cls, row) -> "ActiveUser":
+        """Build from a row selecting the four fields above."""
+        return cls(
+            row['tg_id'],
+            row['name'],
+            row['direction_id'],
+            bool(row['remind_before'])  # SQLite stores 0/1
+        )
 
 
 class UserCreate(BaseModel):
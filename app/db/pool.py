@@ -0,0 +1,184 @@
+"""
+Database connection pool.
+
+Keeps one read-write and several read-only SQLite connections open for the
+life of the process. With WAL enabled the readers run alongside the writer,
+so admin listing pages don't queue behind scheduler writes, and nobody pays
+the connect + PRAGMA cost per query. While open, the pool also checkpoints
+the WAL in the background so it doesn't grow between automatic checkpoints.
+
+In PostgreSQL mode acquire() simply hands out connections from the asyncpg
+pool, so code written against this module works with either backend.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, AsyncIterator, List, Optional
+
+from app.config import settings
+from app.db.connection_cloud import is_postgres, get_connection, release_connection
+from app.utils.logger import logger
+
+if TYPE_CHECKING:
+    import aiosqlite
+
+
+# How often the WAL is copied back into the main database file
+CHECKPOINT_INTERVAL_SECONDS = 60
+
+
+class AsyncDatabasePool:
+    """Pool of one writer and N read-only SQLite connections."""
+
+    def __init__(self, database_path: str, min_readers: int = 4, max_readers: int = 16):
+        self._database_path = database_path
+        self._readers_count = min_readers
+        self._max_readers = max(min_readers, max_readers)
+        self._writer: Optional[aiosqlite.Connection] = None
+        self._write_lock = asyncio.Lock()
+        self._readers: Optional[asyncio.Queue] = None
+        self._all_readers: List[aiosqlite.Connection] = []
+        # Readers open or being opened; reserved under _grow_lock before connecting
+        self._reader_slots = 0
+        self._grow_lock = asyncio.Lock()
+        self._open_lock = asyncio.Lock()
+        self._checkpoint_task: Optional[asyncio.Task] = None
+
+    async def _open_reader(self) -> aiosqlite.Connection:
+        """Open a read-only connection (mode=ro URI)."""
+        import aiosqlite
+        from app.db.connection import SQLITE_CACHED_STATEMENTS
+
+        uri = Path(self._database_path).resolve().as_uri() + "?mode=ro"
+        conn = await aiosqlite.connect(
+            uri, uri=True, cached_statements=SQLITE_CACHED_STATEMENTS
+        )
+        await conn.executescript(
+            "PRAGMA temp_store = MEMORY;"
+            "PRAGMA cache_size = -64000;"
+            "PRAGMA mmap_size = 268435456;"
+            "PRAGMA busy_timeout = 5000;"
+        )
+        conn.row_factory = aiosqlite.Row
+        return conn
+
+    async def open(self):
+        """Open all connections. Called lazily by acquire()."""
+        async with self._open_lock:
+            if self._writer is not None:
+                return
+
+            # Writer first: it switches the file to WAL, which readers rely on
+            writer = await get_connection()
+            readers = asyncio.Queue()
+            for _ in range(self._readers_count):
+                conn = await self._open_reader()
+                self._all_readers.append(conn)
+                readers.put_nowait(conn)
+
+            self._reader_slots = len(self._all_readers)
+            self._readers = readers
+            self._writer = writer
+            self._checkpoint_task = asyncio.create_task(self._checkpoint_loop())
+            logger.info(
+                f"SQLite pool opened (1 writer, {self._readers_count} readers)"
+            )
+
+    async def _checkpoint_loop(self):
+        """Run a PASSIVE WAL checkpoint every CHECKPOINT_INTERVAL_SECONDS."""
+        while True:
+            await asyncio.sleep(CHECKPOINT_INTERVAL_SECONDS)
+            try:
+                # PASSIVE never blocks readers; the lock keeps it out of
+                # another task's open write transaction
+                async with self._write_lock:
+                    await self._writer.execute("PRAGMA wal_checkpoint(PASSIVE)")
+            except Exception as e:
+                logger.warning(f"WAL checkpoint failed: {e}")
+
+    async def close(self):
+        """Close all pooled connections."""
+        async with self._open_lock:
+            if self._checkpoint_task is not None:
+                self._checkpoint_task.cancel()
+                try:
+                    await self._checkpoint_task
+                except asyncio.CancelledError:
+                    pass
+                self._checkpoint_task = None
+
+            for conn in self._all_readers:
+                await conn.close()
+            self._all_readers.clear()
+            self._reader_slots = 0
+            self._readers = None
+
+            if self._writer is not None:
+                await self._writer.close()
+                self._writer = None
+
+    async def _grow_readers(self):
+        """Open one more reader unless the pool is already at its maximum."""
+        async with self._grow_lock:
+            if self._reader_slots >= self._max_readers:
+                return
+            # Reserve the slot first, so concurrent callers can't overshoot
+            # the maximum while this connect is in progress
+            self._reader_slots += 1
+
+        try:
+            conn = await self._open_reader()
+        except BaseException:
+            self._reader_slots -= 1
+            raise
+        self._all_readers.append(conn)
+        self._readers.put_nowait(conn)
+
+    @asynccontextmanager
+    async def acquire(self, read_only: bool = False) -> AsyncIterator[aiosqlite.Connection]:
+        """
+        Borrow a connection for the duration of the block.
+
+        Args:
+            read_only: Use a read-only connection (SELECTs only)
+        """
+        if is_postgres():
+            conn = await get_connection()
+            try:
+                yield conn
+            finally:
+                await release_connection(conn)
+            return
+
+        if self._writer is None:
+            await self.open()
+
+        if read_only:
+            if self._readers.empty():
+                # All readers busy: grow the pool instead of waiting
+                await self._grow_readers()
+            conn = await self._readers.get()
+            try:
+                yield conn
+            finally:
+                self._readers.put_nowait(conn)
+            return
+
+        async with self._write_lock:
+            try:
+                yield self._writer
+            except BaseException:
+                if self._writer.in_transaction:
+                    await self._writer.rollback()
+                raise
+
+
+# Global pool instance
+pool = AsyncDatabasePool(
+    settings.DATABASE_PATH,
+    min_readers=settings.DB_POOL_MIN_SIZE,
+    max_readers=settings.DB_POOL_MAX_SIZE
+)
@@ -22,8 +22,13 @@ from .directions import (
 
 from .pairs import (
     get_pairs_by_direction_and_day,
+    get_pairs_by_directions_and_day,
+    get_pair_at_slot,
+    has_pairs_on_day,
     get_all_pairs,
     get_pair_by_id,
+    get_pair_with_directions,
+    get_pairs_with_directions_by_ids,
     create_pair,
     update_pair,
     delete_pair,
@@ -49,8 +54,13 @@ __all__ = [
     'delete_direction',
     # Pairs
     'get_pairs_by_direction_and_day',
+    'get_pairs_by_directions_and_day',
+    'get_pair_at_slot',
+    'has_pairs_on_day',
     'get_all_pairs',
     'get_pair_by_id',
+    'get_pair_with_directions',
+    'get_pairs_with_directions_by_ids',
     'create_pair',
     'update_pair',
     'delete_pair',
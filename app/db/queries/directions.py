@@ -4,11 +4,16 @@ Directions database queries.
 CRUD operations for directions table.
 """
 
-import aiosqlite
-from typing import List, Optional
+from __future__ import annotations
 
+from typing import TYPE_CHECKING, List, Optional
+
+from app.cache.directions import invalidate_directions
 from app.db.models.direction import Direction, DirectionCreate
 
+if TYPE_CHECKING:
+    import aiosqlite
+
 
 async def get_all_directions(conn: aiosqlite.Connection) -> List[Direction]:
     """
@@ -20,7 +25,9 @@ async def get_all_directions(conn: aiosqlite.Connection) -> List[Direction]:
     Returns:
         List of all directions
     """
-    async with conn.execute("SELECT * FROM directions ORDER BY course, name") as cursor:
+    async with conn.execute(
+        "SELECT id, name, course FROM directions ORDER BY course, name"
+    ) as cursor:
         rows = await cursor.fetchall()
         return [Direction(**dict(row)) for row in rows]
 
@@ -37,7 +44,7 @@ async def get_directions_by_course(conn: aiosqlite.Connection, course: int) -> L
         List of directions for the course
     """
     async with conn.execute(
-        "SELECT * FROM directions WHERE course = ? ORDER BY name", (course,)
+        "SELECT id, name, course FROM directions WHERE course = ? ORDER BY name", (course,)
     ) as cursor:
         rows = await cursor.fetchall()
         return [Direction(**dict(row)) for row in rows]
@@ -55,7 +62,7 @@ async def get_direction_by_id(conn: aiosqlite.Connection, direction_id: int) ->
         Direction object or None
     """
     async with conn.execute(
-        "SELECT * FROM directions WHERE id = ?", (direction_id,)
+        "SELECT id, name, course FROM directions WHERE id = ?", (direction_id,)
     ) as cursor:
         row = await cursor.fetchone()
         if row:
@@ -79,6 +86,7 @@ async def create_direction(conn: aiosqlite.Connection, direction: DirectionCreat
         (direction.name, direction.course)
     )
     await conn.commit()
+    invalidate_directions()
     return cursor.lastrowid
 
 
@@ -105,6 +113,7 @@ async def update_direction(
         (name, course, direction_id)
     )
     await conn.commit()
+    invalidate_directions()
     return True
 
 
@@ -121,4 +130,5 @@ async def delete_direction(conn: aiosqlite.Connection, direction_id: int) -> boo
     """
     await conn.execute("DELETE FROM directions WHERE id = ?", (direction_id,))
     await conn.commit()
+    invalidate_directions()
     return True
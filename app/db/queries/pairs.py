@@ -4,12 +4,16 @@ Pairs (schedule) database queries.
 CRUD operations for pairs and pair_assignments tables.
 """
 
-import aiosqlite
-from typing import List, Optional, Tuple
-from datetime import datetime
+from __future__ import annotations
 
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
+
+from app.db import is_postgres_connection, transaction
 from app.db.models.pair import Pair, PairCreate
 
+if TYPE_CHECKING:
+    import aiosqlite
+
 
 async def get_pairs_by_direction_and_day(
     conn: aiosqlite.Connection,
@@ -38,14 +42,152 @@ async def get_pairs_by_direction_and_day(
     
     async with conn.execute(query, (direction_id, day_of_week)) as cursor:
         rows = await cursor.fetchall()
-        result = []
-        for row in rows:
-            row_dict = dict(row)
-            start_time = row_dict.pop('start_time')
-            end_time = row_dict.pop('end_time')
-            pair = Pair(**row_dict)
-            result.append((pair, start_time, end_time))
-        return result
+        return [
+            (Pair.from_row(row), row['start_time'], row['end_time'])
+            for row in rows
+        ]
+
+
+async def get_pairs_by_directions_and_day(
+    conn: aiosqlite.Connection,
+    direction_ids: Optional[Iterable[int]],
+    day_of_week: int,
+    start_time: Optional[str] = None
+) -> Dict[int, List[Tuple[Pair, str, str]]]:
+    """
+    Get pairs for several directions and one day in a single query.
+    
+    Batch version of get_pairs_by_direction_and_day for jobs that
+    iterate over many users sharing a few directions.
+    
+    Args:
+        conn: Database connection
+        direction_ids: Direction IDs, or None for all directions
+        day_of_week: Day of week (0=Monday)
+        start_time: Only pairs starting at this time (HH:MM), if given
+    
+    Returns:
+        Dict direction_id -> list of tuples (Pair, start_time, end_time);
+        directions without pairs are absent
+    """
+    query = """
+    SELECT p.*, ts.start_time, ts.end_time, pa.direction_id AS assigned_direction_id
+    FROM pairs p
+    JOIN pair_assignments pa ON p.id = pa.pair_id
+    JOIN time_slots ts ON p.time_slot_id = ts.id
+    WHERE p.day_of_week = ?
+    """
+    params = [day_of_week]
+    
+    if direction_ids is not None:
+        ids = list(set(direction_ids))
+        if not ids:
+            return {}
+        query += f" AND pa.direction_id IN ({','.join('?' * len(ids))})"
+        params.extend(ids)
+    
+    if start_time is not None:
+        query += " AND ts.start_time = ?"
+        params.append(start_time)
+    
+    query += " ORDER BY ts.slot_number"
+    
+    cursor = await conn.execute(query, params)
+    rows = await cursor.fetchall()
+    
+    result: Dict[int, List[Tuple[Pair, str, str]]] = {}
+    for row in rows:
+        result.setdefault(row['assigned_direction_id'], []).append(
+            (Pair.from_row(row), row['start_time'], row['end_time'])
+        )
+    return result
+
+
+async def has_pairs_on_day(conn: aiosqlite.Connection, day_of_week: int) -> bool:
+    """
+    Check whether any direction has a pair on the given day.
+    
+    Args:
+        conn: Database connection
+        day_of_week: Day of week (0=Monday)
+    
+    Returns:
+        True if at least one pair is scheduled
+    """
+    cursor = await conn.execute(
+        "SELECT EXISTS(SELECT 1 FROM pairs WHERE day_of_week = ?)",
+        (day_of_week,)
+    )
+    row = await cursor.fetchone()
+    return bool(row[0])
+
+
+async def get_pair_at_slot(
+    conn: aiosqlite.Connection,
+    direction_ids: Optional[Iterable[int]],
+    day_of_week: int,
+    start_time: str
+) -> Dict[int, Tuple[Pair, str, str]]:
+    """
+    Get the pair each direction has at one time slot.
+    
+    Used by reminder jobs: the slot is found by start time, then its pairs
+    for the day via idx_pairs_dow_slot, so only matching rows are read.
+    
+    Args:
+        conn: Database connection
+        direction_ids: Direction IDs, or None for all directions
+        day_of_week: Day of week (0=Monday)
+        start_time: Slot start time (HH:MM)
+    
+    Returns:
+        Dict direction_id -> (Pair, start_time, end_time);
+        directions without a pair at this slot are absent
+    """
+    query = """
+    SELECT p.*, ts.start_time, ts.end_time, pa.direction_id AS assigned_direction_id
+    FROM time_slots ts
+    JOIN pairs p ON p.time_slot_id = ts.id AND p.day_of_week = ?
+    JOIN pair_assignments pa ON pa.pair_id = p.id
+    WHERE ts.start_time = ?
+    """
+    params = [day_of_week, start_time]
+    
+    if direction_ids is not None:
+        ids = list(set(direction_ids))
+        if not ids:
+            return {}
+        query += f" AND pa.direction_id IN ({','.join('?' * len(ids))})"
+        params.extend(ids)
+    
+    query += " ORDER BY p.id"
+    
+    cursor = await conn.execute(query, params)
+    rows = await cursor.fetchall()
+    
+    result: Dict[int, Tuple[Pair, str, str]] = {}
+    for row in rows:
+        # Overlapping pairs of one direction: remind about the first one
+        result.setdefault(
+            row['assigned_direction_id'],
+            (Pair.from_row(row), row['start_time'], row['end_time'])
+        )
+    return result
+
+
+def _group_concat_ids(conn: aiosqlite.Connection, column: str) -> str:
+    """SQL aggregate that joins integer IDs into a comma-separated string."""
+    # Dialect of this connection: admin uses SQLite even in PostgreSQL mode
+    if is_postgres_connection(conn):
+        return f"string_agg({column}::text, ',')"
+    return f"GROUP_CONCAT({column})"
+
+
+def _split_ids(value: Optional[str]) -> List[int]:
+    """Parse a comma-separated ID aggregate into a list of ints."""
+    if not value:
+        return []
+    return [int(part) for part in str(value).split(',')]
 
 
 async def get_all_pairs(conn: aiosqlite.Connection) -> List[Pair]:
@@ -62,7 +204,7 @@ async def get_all_pairs(conn: aiosqlite.Connection) -> List[Pair]:
         "SELECT * FROM pairs ORDER BY day_of_week, time_slot_id"
     ) as cursor:
         rows = await cursor.fetchall()
-        return [Pair(**dict(row)) for row in rows]
+        return [Pair.from_row(row) for row in rows]
 
 
 async def get_pair_by_id(conn: aiosqlite.Connection, pair_id: int) -> Optional[Pair]:
@@ -79,10 +221,62 @@ async def get_pair_by_id(conn: aiosqlite.Connection, pair_id: int) -> Optional[P
     async with conn.execute("SELECT * FROM pairs WHERE id = ?", (pair_id,)) as cursor:
         row = await cursor.fetchone()
         if row:
-            return Pair(**dict(row))
+            return Pair.from_row(row)
         return None
 
 
+async def get_pair_with_directions(
+    conn: aiosqlite.Connection,
+    pair_id: int
+) -> Optional[Tuple[Pair, List[int]]]:
+    """
+    Get pair by ID together with its assigned direction IDs.
+    
+    Args:
+        conn: Database connection
+        pair_id: Pair ID
+    
+    Returns:
+        Tuple (Pair, direction_ids) or None
+    """
+    pairs = await get_pairs_with_directions_by_ids(conn, [pair_id])
+    return pairs.get(pair_id)
+
+
+async def get_pairs_with_directions_by_ids(
+    conn: aiosqlite.Connection,
+    pair_ids: List[int]
+) -> Dict[int, Tuple[Pair, List[int]]]:
+    """
+    Get several pairs with their assigned direction IDs in one query.
+    
+    Args:
+        conn: Database connection
+        pair_ids: Pair IDs to load
+    
+    Returns:
+        Dict mapping pair ID to (Pair, direction_ids); missing IDs are absent
+    """
+    if not pair_ids:
+        return {}
+    
+    placeholders = ', '.join('?' * len(pair_ids))
+    query = f"""
+    SELECT p.*, {_group_concat_ids(conn, 'pa.direction_id')} AS direction_ids
+    FROM pairs p
+    LEFT JOIN pair_assignments pa ON p.id = pa.pair_id
+    WHERE p.id IN ({placeholders})
+    GROUP BY p.id
+    """
+    
+    cursor = await conn.execute(query, tuple(pair_ids))
+    rows = await cursor.fetchall()
+    return {
+        row['id']: (Pair.from_row(row), _split_ids(row['direction_ids']))
+        for row in rows
+    }
+
+
 async def create_pair(
     conn: aiosqlite.Connection,
     pair_data: PairCreate,
@@ -99,25 +293,24 @@ async def create_pair(
     Returns:
         ID of created pair
     """
-    # Create pair
-    cursor = await conn.execute(
-        """
-        INSERT INTO pairs (title, teacher, room, type, day_of_week, time_slot_id, extra_link)
-        VALUES (?, ?, ?, ?, ?, ?, ?)
-        """,
-        (pair_data.title, pair_data.teacher, pair_data.room, pair_data.type,
-         pair_data.day_of_week, pair_data.time_slot_id, pair_data.extra_link)
-    )
-    pair_id = cursor.lastrowid
-    
-    # Create assignments
-    for direction_id in direction_ids:
-        await conn.execute(
+    async with transaction(conn):
+        # Create pair
+        cursor = await conn.execute(
+            """
+            INSERT INTO pairs (title, teacher, room, type, day_of_week, time_slot_id, extra_link)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+            (pair_data.title, pair_data.teacher, pair_data.room, pair_data.type,
+             pair_data.day_of_week, pair_data.time_slot_id, pair_data.extra_link)
+        )
+        pair_id = cursor.lastrowid
+        
+        # Create assignments
+        await conn.executemany(
             "INSERT INTO pair_assignments (pair_id, direction_id) VALUES (?, ?)",
-            (pair_id, direction_id)
+            [(pair_id, direction_id) for direction_id in direction_ids]
         )
     
-    await conn.commit()
     return pair_id
 
 
@@ -139,33 +332,32 @@ async def update_pair(
     Returns:
         True if updated
     """
-    # Update pair
-    await conn.execute(
-        """
-        UPDATE pairs 
-        SET title = ?, teacher = ?, room = ?, type = ?, 
-            day_of_week = ?, time_slot_id = ?, extra_link = ?,
-            updated_at = ?
-        WHERE id = ?
-        """,
-        (pair_data.title, pair_data.teacher, pair_data.room, pair_data.type,
-         pair_data.day_of_week, pair_data.time_slot_id, pair_data.extra_link,
-         datetime.now().isoformat(), pair_id)
-    )
-    
-    # Update assignments if provided
-    if direction_ids is not None:
-        # Delete old assignments
-        await conn.execute("DELETE FROM pair_assignments WHERE pair_id = ?", (pair_id,))
+    async with transaction(conn):
+        # Update pair
+        await conn.execute(
+            """
+            UPDATE pairs 
+            SET title = ?, teacher = ?, room = ?, type = ?, 
+                day_of_week = ?, time_slot_id = ?, extra_link = ?,
+                updated_at = CURRENT_TIMESTAMP
+            WHERE id = ?
+            """,
+            (pair_data.title, pair_data.teacher, pair_data.room, pair_data.type,
+             pair_data.day_of_week, pair_data.time_slot_id, pair_data.extra_link,
+             pair_id)
+        )
         
-        # Create new assignments
-        for direction_id in direction_ids:
-            await conn.execute(
+        # Update assignments if provided
+        if direction_ids is not None:
+            # Delete old assignments
+            await conn.execute("DELETE FROM pair_assignments WHERE pair_id = ?", (pair_id,))
+            
+            # Create new assignments
+            await conn.executemany(
                 "INSERT INTO pair_assignments (pair_id, direction_id) VALUES (?, ?)",
-                (pair_id, direction_id)
+                [(pair_id, direction_id) for direction_id in direction_ids]
             )
     
-    await conn.commit()
     return True
 
 
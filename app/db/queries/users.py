@@ -4,11 +4,21 @@ User database queries.
 CRUD operations for users table.
 """
 
-import aiosqlite
-from typing import Optional, List
-from datetime import datetime
+from __future__ import annotations
 
-from app.db.models.user import User, UserCreate
+from typing import TYPE_CHECKING, Optional, List
+
+from app.cache.directions import get_direction_name
+from app.cache.ttl import async_ttl_cache
+from app.db import transaction
+from app.db.models.user import ActiveUser, User, UserCreate
+
+if TYPE_CHECKING:
+    import aiosqlite
+
+
+# Scheduler jobs running close together reuse one active user list
+ACTIVE_USERS_TTL_SECONDS = 60
 
 
 async def get_user_by_tg_id(conn: aiosqlite.Connection, tg_id: int) -> Optional[dict]:
@@ -22,27 +32,19 @@ async def get_user_by_tg_id(conn: aiosqlite.Connection, tg_id: int) -> Optional[
     Returns:
         User dict or None if not found
     """
-    async with conn.execute(
-        """
-        SELECT 
-            u.*,
-            d.name as direction_name
-        FROM users u
-        LEFT JOIN directions d ON u.direction_id = d.id
-        WHERE u.tg_id = ?
-        """,
-        (tg_id,)
-    ) as cursor:
-        row = await cursor.fetchone()
-        if row:
-            return dict(row)
+    cursor = await conn.execute("SELECT * FROM users WHERE tg_id = ?", (tg_id,))
+    row = await cursor.fetchone()
+    if not row:
         return None
+    
+    # Direction name comes from the in-process cache instead of a JOIN
+    user = dict(row)
+    user['direction_name'] = await get_direction_name(conn, user['direction_id'])
+    return user
 
 
-# Alias for consistency
-async def get_user_by_telegram_id(conn: aiosqlite.Connection, tg_id: int) -> Optional[dict]:
-    """Alias for get_user_by_tg_id."""
-    return await get_user_by_tg_id(conn, tg_id)
+# Alias for consistency (plain binding, no extra coroutine frame per call)
+get_user_by_telegram_id = get_user_by_tg_id
 
 
 async def create_user(conn: aiosqlite.Connection, user_data: UserCreate) -> int:
@@ -65,6 +67,7 @@ async def create_user(conn: aiosqlite.Connection, user_data: UserCreate) -> int:
          user_data.direction_id, user_data.remind_before)
     )
     await conn.commit()
+    get_active_users.cache_clear()
     return cursor.lastrowid
 
 
@@ -100,15 +103,15 @@ async def update_user_settings(
     if not updates:
         return False
     
-    updates.append("updated_at = ?")
-    params.append(datetime.now().isoformat())
+    updates.append("updated_at = CURRENT_TIMESTAMP")
     
     params.append(tg_id)
     
     query = f"UPDATE users SET {', '.join(updates)} WHERE tg_id = ?"
     
-    await conn.execute(query, params)
-    await conn.commit()
+    async with transaction(conn):
+        await conn.execute(query, params)
+    get_active_users.cache_clear()
     return True
 
 
@@ -130,36 +133,43 @@ async def update_user_direction(
     Returns:
         True if updated successfully
     """
-    await conn.execute(
-        """
-        UPDATE users 
-        SET course = ?, direction_id = ?, updated_at = ?
-        WHERE tg_id = ?
-        """,
-        (course, direction_id, datetime.now().isoformat(), tg_id)
-    )
-    await conn.commit()
+    async with transaction(conn):
+        await conn.execute(
+            """
+            UPDATE users 
+            SET course = ?, direction_id = ?, updated_at = CURRENT_TIMESTAMP
+            WHERE tg_id = ?
+            """,
+            (course, direction_id, tg_id)
+        )
+    get_active_users.cache_clear()
     return True
 
 
-async def get_active_users(conn: aiosqlite.Connection) -> List[User]:
+@async_ttl_cache(ttl=ACTIVE_USERS_TTL_SECONDS)
+async def get_active_users(conn: aiosqlite.Connection) -> List[ActiveUser]:
     """
     Get all active users (not paused).
     
+    Returns compact ActiveUser tuples with the fields scheduler jobs use.
+    The result is cached for ACTIVE_USERS_TTL_SECONDS and shared between
+    callers; don't modify the returned list. User writes in this module
+    clear the cache.
+    
     Args:
         conn: Database connection
     
     Returns:
         List of active users
     """
-    async with conn.execute(
+    cursor = await conn.execute(
         """
-        SELECT * FROM users 
+        SELECT tg_id, name, direction_id, remind_before FROM users 
         WHERE paused_until IS NULL OR paused_until < datetime('now')
         """
-    ) as cursor:
-        rows = await cursor.fetchall()
-        return [User(**dict(row)) for row in rows]
+    )
+    rows = await cursor.fetchall()
+    return [ActiveUser.from_row(row) for row in rows]
 
 
 async def get_users_by_direction(
@@ -186,7 +196,7 @@ async def get_users_by_direction(
     
     async with conn.execute(query, params) as cursor:
         rows = await cursor.fetchall()
-        return [User(**dict(row)) for row in rows]
+        return [User.from_row(row) for row in rows]
 
 
 async def delete_user(conn: aiosqlite.Connection, tg_id: int) -> bool:
@@ -200,6 +210,7 @@ async def delete_user(conn: aiosqlite.Connection, tg_id: int) -> bool:
     Returns:
         True if deleted successfully
     """
-    await conn.execute("DELETE FROM users WHERE tg_id = ?", (tg_id,))
-    await conn.commit()
+    async with transaction(conn):
+        await conn.execute("DELETE FROM users WHERE tg_id = ?", (tg_id,))
+    get_active_users.cache_clear()
     return True
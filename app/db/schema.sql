@@ -19,7 +19,9 @@ CREATE TABLE IF NOT EXISTS users (
 );
 
 CREATE INDEX IF NOT EXISTS idx_users_tg_id ON users(tg_id);
-CREATE INDEX IF NOT EXISTS idx_users_direction ON users(direction_id);
+-- Serves get_users_by_direction (direction + pause filter); replaces idx_users_direction
+DROP INDEX IF EXISTS idx_users_direction;
+CREATE INDEX IF NOT EXISTS idx_users_direction_paused ON users(direction_id, paused_until);
 CREATE INDEX IF NOT EXISTS idx_users_paused ON users(paused_until);
 
 
@@ -47,6 +49,8 @@ CREATE TABLE IF NOT EXISTS time_slots (
 );
 
 CREATE INDEX IF NOT EXISTS idx_time_slots_number ON time_slots(slot_number);
+-- Reminder jobs look slots up by start time
+CREATE INDEX IF NOT EXISTS idx_time_slots_start ON time_slots(start_time);
 
 
 -- === Pairs Table ===
@@ -65,7 +69,9 @@ CREATE TABLE IF NOT EXISTS pairs (
     FOREIGN KEY (time_slot_id) REFERENCES time_slots(id) ON DELETE RESTRICT
 );
 
-CREATE INDEX IF NOT EXISTS idx_pairs_day ON pairs(day_of_week);
+-- Serves day lookups ordered by slot; replaces idx_pairs_day
+DROP INDEX IF EXISTS idx_pairs_day;
+CREATE INDEX IF NOT EXISTS idx_pairs_dow_slot ON pairs(day_of_week, time_slot_id);
 CREATE INDEX IF NOT EXISTS idx_pairs_slot ON pairs(time_slot_id);
 
 
@@ -83,7 +89,9 @@ CREATE TABLE IF NOT EXISTS pair_assignments (
 );
 
 CREATE INDEX IF NOT EXISTS idx_assignments_pair ON pair_assignments(pair_id);
-CREATE INDEX IF NOT EXISTS idx_assignments_direction ON pair_assignments(direction_id);
+-- Covering index for direction -> pairs joins; replaces idx_assignments_direction
+DROP INDEX IF EXISTS idx_assignments_direction;
+CREATE INDEX IF NOT EXISTS idx_pa_direction ON pair_assignments(direction_id, pair_id);
 
 
 -- === Delivery Log Table ===
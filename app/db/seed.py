@@ -0,0 +1,89 @@
+"""
+Initial reference data.
+
+Directions every fresh database starts with. Used by the cloud
+initialization script; seed.sql covers local SQLite setup.
+"""
+
+from typing import Tuple
+
+from app.db import get_connection
+from app.db.connection_cloud import is_postgres, release_connection, transaction
+from app.utils.logger import logger
+
+
+# Initial directions per course, as (course, name) rows
+_DIRECTIONS: Tuple[Tuple[int, str], ...] = (
+    # Course 1
+    (1, "Математика"),
+    (1, "Мат. основы ИИ"),
+    (1, "ИИ в мат. и IT"),
+    (1, "ПМ"),
+    (1, "МОАИС"),
+    (1, "ИБ"),
+    # Course 2
+    (2, "Математика"),
+    (2, "ПМ"),
+    (2, "МОАИС"),
+    (2, "ИБ"),
+    # Course 3
+    (3, "Математика"),
+    (3, "ПМ"),
+    (3, "МОАИС"),
+    (3, "ИБ"),
+    # Course 4
+    (4, "Математика"),
+    (4, "ПМ"),
+    (4, "МОАИС"),
+    (4, "ИБ"),
+)
+
+# All rows in one multi-row INSERT (36 parameters, well under SQLite's limit)
+_DIRECTIONS_INSERT_SQL = (
+    "INSERT INTO directions (course, name) VALUES "
+    + ", ".join(["(?, ?)"] * len(_DIRECTIONS))
+)
+_DIRECTIONS_PARAMS = tuple(value for row in _DIRECTIONS for value in row)
+
+
+async def seed_directions(conn=None):
+    """
+    Seed initial directions for all courses.
+    
+    The emptiness check and the insert run in one transaction.
+    
+    Args:
+        conn: Connection to use; if None, one is acquired and released here
+    """
+    own_conn = conn is None
+    if own_conn:
+        conn = await get_connection()
+    
+    try:
+        async with transaction(conn):
+            # Check if directions already exist
+            cursor = await conn.execute("SELECT COUNT(*) as count FROM directions")
+            row = await cursor.fetchone()
+            count = row['count'] if row else 0
+            
+            if count > 0:
+                logger.info(f"Directions already seeded ({count} found)")
+                return
+            
+            if is_postgres():
+                # Binary COPY: all rows in one round trip, no per-row parsing
+                await conn.raw_connection.copy_records_to_table(
+                    "directions", records=_DIRECTIONS, columns=["course", "name"]
+                )
+            else:
+                # One statement for all rows
+                await conn.execute(_DIRECTIONS_INSERT_SQL, _DIRECTIONS_PARAMS)
+        
+        logger.info(f"✓ Seeded {len(_DIRECTIONS)} directions")
+        
+    except Exception as e:
+        logger.error(f"Failed to seed directions: {e}")
+        raise
+    finally:
+        if own_conn:
+            await release_connection(conn)
@@ -0,0 +1,33 @@
+"""
+SQLite -> PostgreSQL query conversion.
+
+Queries are written in SQLite syntax. This module has no app imports, so
+it can be used from app.db and from scripts without circular imports.
+"""
+
+import itertools
+import re
+from functools import lru_cache
+
+_PLACEHOLDER_RE = re.compile(r'\?')
+
+
+@lru_cache(maxsize=512)
+def convert_query(query: str) -> str:
+    """
+    Convert SQLite query syntax to PostgreSQL.
+    - ? placeholders to $1, $2, etc.
+    - datetime('now') to NOW()
+    - AUTOINCREMENT to SERIAL
+    
+    Results are cached: the app uses a fixed set of literal queries.
+    """
+    # Convert ? placeholders (numbered left to right)
+    counter = itertools.count(1)
+    query = _PLACEHOLDER_RE.sub(lambda _: f'${next(counter)}', query)
+    
+    # Convert SQLite functions to PostgreSQL
+    query = query.replace("datetime('now')", "NOW()")
+    query = query.replace("AUTOINCREMENT", "")  # PostgreSQL uses SERIAL
+    
+    return query
@@ -6,18 +6,90 @@ Supports both local (polling) and cloud (webhook) modes.
 """
 
 import asyncio
+import hmac
+import importlib
 import os
+import secrets
 import sys
 from datetime import datetime
+from pathlib import Path
 from aiogram import Bot, Dispatcher
 from aiogram.client.default import DefaultBotProperties
 from aiogram.enums import ParseMode
+from aiogram.fsm.storage.base import BaseStorage
 from aiogram.fsm.storage.memory import MemoryStorage
+from aiogram.types import Update
+import uvicorn
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import HTMLResponse, RedirectResponse, Response
+from fastapi.staticfiles import StaticFiles
+from fastapi.templating import Jinja2Templates
+from starlette.exceptions import HTTPException as StarletteHTTPException
 
 from app.config import settings
+from app.db import pool
+from app.bot.handlers import register_handlers
+from app.scheduler import setup_scheduler
 from app.utils.logger import logger
 
 
+# Modules exposing an admin panel APIRouter as `router`, in inclusion order
+ADMIN_ROUTER_MODULES = (
+    "app.admin",
+    "app.admin.pairs",
+    "app.admin.directions",
+    "app.admin.slots",
+    "app.admin.broadcast",
+    "app.admin.logs",
+)
+
+
+def create_fsm_storage() -> BaseStorage:
+    """
+    Create FSM storage for the dispatcher.
+    
+    Returns:
+        RedisStorage if REDIS_URL is configured, otherwise MemoryStorage
+    """
+    if settings.REDIS_URL:
+        # Imported only when configured; requires the redis package
+        from aiogram.fsm.storage.redis import RedisStorage
+        logger.info("Using Redis FSM storage")
+        return RedisStorage.from_url(settings.REDIS_URL)
+    return MemoryStorage()
+
+
+def register_webhook(app: FastAPI, bot: Bot, dp: Dispatcher, secret: str):
+    """
+    Receive Telegram updates on WEBHOOK_PATH of the FastAPI app.
+    
+    Updates are processed in background tasks so Telegram gets its
+    response immediately, like aiogram's own webhook request handler.
+    Requests without the secret token passed to set_webhook are rejected.
+    
+    Args:
+        app: FastAPI application
+        bot: Bot instance
+        dp: Dispatcher with registered handlers
+        secret: Secret token Telegram sends with every update
+    """
+    background_tasks = set()
+    
+    @app.post(settings.WEBHOOK_PATH, include_in_schema=False)
+    async def telegram_webhook(request: Request):
+        token = request.headers.get("X-Telegram-Bot-Api-Secret-Token", "")
+        # Constant-time comparison, so response timing doesn't leak the secret
+        if not hmac.compare_digest(token.encode(), secret.encode()):
+            return Response(status_code=401)
+        
+        update = Update.model_validate(await request.json(), context={"bot": bot})
+        task = asyncio.create_task(dp.feed_update(bot, update))
+        background_tasks.add(task)
+        task.add_done_callback(background_tasks.discard)
+        return Response(status_code=200)
+
+
 def is_cloud_deployment() -> bool:
     """Check if running in cloud environment."""
     return bool(os.environ.get('RAILWAY_ENVIRONMENT') or 
@@ -49,14 +121,12 @@ async def main():
         logger.warning(f"Could not clear webhook: {e}")
     
     # Initialize dispatcher with FSM storage
-    dp = Dispatcher(storage=MemoryStorage())
+    dp = Dispatcher(storage=create_fsm_storage())
     
     # Register handlers
-    from app.bot.handlers import register_handlers
     register_handlers(dp)
     
     # Initialize scheduler
-    from app.scheduler import setup_scheduler
     scheduler = await setup_scheduler(bot)
     scheduler.start()
     
@@ -77,60 +147,69 @@ async def main():
             logger.info("Scheduler stopped")
         
         await bot.session.close()
+        await dp.storage.close()
+        await pool.close()
         logger.info("Bot stopped.")
 
 
-async def start_admin_panel():
-    """Start FastAPI admin panel."""
-    import os
-    import uvicorn
-    import traceback
-    from fastapi import FastAPI, Request
-    from fastapi.responses import RedirectResponse, Response, HTMLResponse
-    from fastapi.staticfiles import StaticFiles
-    from fastapi.templating import Jinja2Templates
-    from starlette.exceptions import HTTPException as StarletteHTTPException
-    from app.admin import router
-    from app.admin.pairs import router as pairs_router
-    from app.admin.directions import router as directions_router
-    from app.admin.slots import router as slots_router
-    from app.admin.broadcast import router as broadcast_router
-    from app.admin.logs import router as logs_router
-    
-    logger.info("Starting Admin Panel...")
-    
+def build_admin_app(
+    mode: str = "admin",
+    scheduler=None,
+    include_admin: bool = True,
+    bot_mode: str = "stopped"
+):
+    """
+    Build the FastAPI admin application.
+    
+    Shared by admin-only and combined modes so middleware, error handlers,
+    static files and routers are set up in one place.
+    
+    Args:
+        mode: Service mode reported by the health check
+        scheduler: Running scheduler (combined mode), reported by the health check
+        include_admin: Mount the admin panel routers (False serves only
+            the health check, favicon and error pages)
+        bot_mode: How the bot receives updates, reported by the health check
+    
+    Returns:
+        Configured FastAPI application
+    """
     app = FastAPI(title="AGU ScheduleBot Admin")
     templates = Jinja2Templates(directory='templates/errors')
     
-    # Add middleware for handling OPTIONS and HEAD requests
-    @app.middleware("http")
-    async def catch_all_middleware(request: Request, call_next):
-        # Handle OPTIONS requests for CORS preflight
-        if request.method == "OPTIONS":
-            return Response(status_code=200, headers={
-                "Access-Control-Allow-Origin": "*",
-                "Access-Control-Allow-Methods": "GET, POST, PUT, DELETE, OPTIONS, HEAD",
-                "Access-Control-Allow-Headers": "*",
-            })
-        
-        # Handle HEAD requests gracefully (for health checks)
-        if request.method == "HEAD":
-            return Response(status_code=200)
-        
-        try:
-            response = await call_next(request)
-            return response
-        except Exception as e:
-            # Log the error but don't crash the server
-            if "405" not in str(e):  # Don't spam 405 errors
+    # CORS preflight is answered by Starlette; HEAD and stray methods fall
+    # through to the 405 branch of http_exception_handler below
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],
+        allow_methods=["*"],
+        allow_headers=["*"]
+    )
+    
+    if settings.DEBUG:
+        # Log failing requests with method and path (debug only)
+        @app.middleware("http")
+        async def log_errors_middleware(request: Request, call_next):
+            try:
+                return await call_next(request)
+            except Exception as e:
                 logger.error(f"Request error on {request.method} {request.url.path}: {e}")
-            raise
+                raise
     
     # Mount static files
     static_path = os.path.join(os.path.dirname(__file__), "web", "static")
     if os.path.exists(static_path):
         app.mount("/static", StaticFiles(directory=static_path), name="static")
     
+    # Read the favicon once instead of opening the file on every request
+    favicon_path = Path(static_path) / "images" / "favicon.ico"
+    favicon_bytes = favicon_path.read_bytes() if favicon_path.is_file() else None
+    
+    # Without DEBUG the 500 page never shows error details, so render it once
+    error_500_html = None
+    if not settings.DEBUG:
+        error_500_html = templates.get_template("500.html").render(error_detail=None)
+    
     # Exception handler for HTTP errors
     @app.exception_handler(StarletteHTTPException)
     async def http_exception_handler(request: Request, exc: StarletteHTTPException):
@@ -156,22 +235,14 @@ async def start_admin_panel():
                 status_code=404
             )
         # Re-raise other HTTP exceptions
-        from fastapi import HTTPException
-        raise HTTPException(status_code=exc.status_code, detail=exc.detail)
-        if exc.status_code == 404:
-            return templates.TemplateResponse(
-                "404.html",
-                {"request": request, "path": request.url.path},
-                status_code=404
-            )
-        # Re-raise other HTTP exceptions
-        from fastapi import HTTPException
         raise HTTPException(status_code=exc.status_code, detail=exc.detail)
     
     # General exception handler for 500 errors
     @app.exception_handler(Exception)
     async def general_exception_handler(request: Request, exc: Exception):
         logger.error(f"Internal server error: {exc}", exc_info=True)
+        if error_500_html is not None:
+            return HTMLResponse(error_500_html, status_code=500)
         error_detail = str(exc) if settings.DEBUG else None
         return templates.TemplateResponse(
             "500.html",
@@ -182,23 +253,63 @@ async def start_admin_panel():
     # Favicon route (returns empty if no favicon exists)
     @app.get("/favicon.ico")
     async def favicon():
-        favicon_path = os.path.join(static_path, "images", "favicon.ico")
-        if os.path.exists(favicon_path):
-            with open(favicon_path, "rb") as f:
-                return Response(content=f.read(), media_type="image/x-icon")
+        if favicon_bytes is not None:
+            return Response(
+                content=favicon_bytes,
+                media_type="image/x-icon",
+                headers={"Cache-Control": "public, max-age=86400"}
+            )
         return Response(status_code=204)
     
-    # Root redirect
-    @app.get("/")
-    async def root():
-        return RedirectResponse(url='/admin/login', status_code=302)
+    # Health check endpoint for cloud platforms
+    # Supports both GET and HEAD requests
+    @app.get("/health")
+    @app.head("/health")
+    async def health_check():
+        try:
+            # Basic health indicators
+            health_status = {
+                "status": "healthy",
+                "mode": mode,
+                "timestamp": datetime.now().isoformat(),
+                "services": {
+                    "web": "running",
+                    "bot": bot_mode,
+                    "scheduler": scheduler.running if scheduler is not None else False
+                }
+            }
+            
+            # Test database connection
+            try:
+                async with pool.acquire(read_only=True) as conn:
+                    await conn.execute("SELECT 1")
+                health_status["services"]["database"] = "connected"
+            except Exception:
+                health_status["services"]["database"] = "disconnected"
+                health_status["status"] = "degraded"
+            
+            return health_status
+        except Exception as e:
+            return {"status": "unhealthy", "error": str(e)}
+    
+    if include_admin:
+        # Root redirect
+        @app.get("/")
+        async def root():
+            return RedirectResponse(url='/admin/login', status_code=302)
+        
+        # Admin modules are imported here only, never on the bot-only path
+        for module_name in ADMIN_ROUTER_MODULES:
+            app.include_router(importlib.import_module(module_name).router)
     
-    app.include_router(router)
-    app.include_router(pairs_router)
-    app.include_router(directions_router)
-    app.include_router(slots_router)
-    app.include_router(broadcast_router)
-    app.include_router(logs_router)
+    return app
+
+
+async def start_admin_panel():
+    """Start FastAPI admin panel."""
+    logger.info("Starting Admin Panel...")
+    
+    app = build_admin_app()
     
     # Use PORT from environment (for cloud deployment) or fallback to config
     port = int(os.environ.get('PORT', settings.ADMIN_PORT))
@@ -211,26 +322,24 @@ async def start_admin_panel():
         log_level="info"
     )
     server = uvicorn.Server(config)
-    await server.serve()
+    try:
+        await server.serve()
+    finally:
+        await pool.close()
 
 
-async def start_combined():
-    """Start both bot and admin panel together (for single-service cloud deployment)."""
-    import os
-    import uvicorn
-    from fastapi import FastAPI, Request
-    from fastapi.responses import RedirectResponse, Response
-    from fastapi.staticfiles import StaticFiles
-    from fastapi.templating import Jinja2Templates
-    from starlette.exceptions import HTTPException as StarletteHTTPException
-    from app.admin import router
-    from app.admin.pairs import router as pairs_router
-    from app.admin.directions import router as directions_router
-    from app.admin.slots import router as slots_router
-    from app.admin.broadcast import router as broadcast_router
-    from app.admin.logs import router as logs_router
-    
-    logger.info("Starting Combined Mode (Bot + Admin Panel)...")
+async def start_combined(include_admin: bool = True):
+    """
+    Start both bot and admin panel together (for single-service cloud deployment).
+    
+    Args:
+        include_admin: Serve the admin panel; if False only the health check
+            is exposed and the admin modules are never imported
+    """
+    if include_admin:
+        logger.info("Starting Combined Mode (Bot + Admin Panel)...")
+    else:
+        logger.info("Starting Combined Mode (Bot + health check, admin disabled)...")
     
     # Initialize bot
     bot = Bot(
@@ -238,135 +347,51 @@ async def start_combined():
         default=DefaultBotProperties(parse_mode=ParseMode.HTML)
     )
     
-    # Clear webhook and ensure clean start
-    try:
-        await bot.delete_webhook(drop_pending_updates=True)
-        logger.info("✅ Webhook cleared for polling mode")
-    except Exception as e:
-        logger.warning(f"Could not clear webhook: {e}")
-    
     # Initialize dispatcher with FSM storage
-    dp = Dispatcher(storage=MemoryStorage())
+    dp = Dispatcher(storage=create_fsm_storage())
     
     # Register handlers
-    from app.bot.handlers import register_handlers
     register_handlers(dp)
     
-    # Initialize scheduler
-    from app.scheduler import setup_scheduler
-    scheduler = await setup_scheduler(bot)
-    scheduler.start()
+    # Webhooks need a public URL, so they are only used in the cloud
+    use_webhook = is_cloud_deployment() and bool(settings.WEBHOOK_URL)
     
-    # Create FastAPI app
-    app = FastAPI(title="AGU ScheduleBot Admin")
-    templates = Jinja2Templates(directory='templates/errors')
-    
-    # Add middleware for handling OPTIONS and HEAD requests
-    @app.middleware("http")
-    async def catch_all_middleware(request: Request, call_next):
-        # Handle OPTIONS requests for CORS preflight
-        if request.method == "OPTIONS":
-            return Response(status_code=200, headers={
-                "Access-Control-Allow-Origin": "*",
-                "Access-Control-Allow-Methods": "GET, POST, PUT, DELETE, OPTIONS, HEAD",
-                "Access-Control-Allow-Headers": "*",
-            })
-        
-        # Handle HEAD requests gracefully (for health checks)
-        if request.method == "HEAD":
-            return Response(status_code=200)
-        
+    if use_webhook:
+        webhook_url = settings.WEBHOOK_URL.rstrip('/') + settings.WEBHOOK_PATH
+        # The webhook endpoint is public, so it always needs a secret
+        webhook_secret = settings.WEBHOOK_SECRET or secrets.token_urlsafe(32)
         try:
-            response = await call_next(request)
-            return response
-        except Exception as e:
-            # Log the error but don't crash the server
-            if "405" not in str(e):  # Don't spam 405 errors
-                logger.error(f"Request error on {request.method} {request.url.path}: {e}")
-            raise
-    
-    # Mount static files
-    static_path = os.path.join(os.path.dirname(__file__), "web", "static")
-    if os.path.exists(static_path):
-        app.mount("/static", StaticFiles(directory=static_path), name="static")
-    
-    # Exception handlers
-    @app.exception_handler(StarletteHTTPException)
-    async def http_exception_handler(request: Request, exc: StarletteHTTPException):
-        if exc.status_code == 303 and exc.headers and "Location" in exc.headers:
-            return RedirectResponse(url=exc.headers["Location"], status_code=303)
-        if request.url.path == "/favicon.ico":
-            return Response(status_code=204)
-        if exc.status_code == 404:
-            return templates.TemplateResponse(
-                "404.html",
-                {"request": request, "path": request.url.path},
-                status_code=404
+            await bot.set_webhook(
+                webhook_url,
+                secret_token=webhook_secret,
+                allowed_updates=dp.resolve_used_update_types(),
+                drop_pending_updates=True
             )
-        from fastapi import HTTPException
-        raise HTTPException(status_code=exc.status_code, detail=exc.detail)
-    
-    @app.exception_handler(Exception)
-    async def general_exception_handler(request: Request, exc: Exception):
-        logger.error(f"Internal server error: {exc}", exc_info=True)
-        error_detail = str(exc) if settings.DEBUG else None
-        return templates.TemplateResponse(
-            "500.html",
-            {"request": request, "error_detail": error_detail},
-            status_code=500
-        )
-    
-    @app.get("/favicon.ico")
-    async def favicon():
-        favicon_path = os.path.join(static_path, "images", "favicon.ico")
-        if os.path.exists(favicon_path):
-            with open(favicon_path, "rb") as f:
-                return Response(content=f.read(), media_type="image/x-icon")
-        return Response(status_code=204)
-    
-    @app.get("/")
-    async def root():
-        return RedirectResponse(url='/admin/login', status_code=302)
+            logger.info(f"✅ Webhook set to {webhook_url}")
+        except Exception as e:
+            logger.error(f"Could not set webhook, falling back to polling: {e}")
+            use_webhook = False
     
-    # Health check endpoint for cloud platforms
-    # Supports both GET and HEAD requests
-    @app.get("/health")
-    @app.head("/health")
-    async def health_check():
+    if not use_webhook:
+        # Clear webhook and ensure clean start
         try:
-            # Basic health indicators
-            health_status = {
-                "status": "healthy",
-                "mode": "combined",
-                "timestamp": datetime.now().isoformat(),
-                "services": {
-                    "web": "running",
-                    "bot": "polling",
-                    "scheduler": scheduler.running if 'scheduler' in locals() else False
-                }
-            }
-            
-            # Test database connection
-            try:
-                from app.db import get_connection
-                conn = await get_connection()
-                await conn.execute("SELECT 1")
-                await conn.close()
-                health_status["services"]["database"] = "connected"
-            except Exception:
-                health_status["services"]["database"] = "disconnected"
-                health_status["status"] = "degraded"
-            
-            return health_status
+            await bot.delete_webhook(drop_pending_updates=True)
+            logger.info("✅ Webhook cleared for polling mode")
         except Exception as e:
-            return {"status": "unhealthy", "error": str(e)}
+            logger.warning(f"Could not clear webhook: {e}")
     
-    app.include_router(router)
-    app.include_router(pairs_router)
-    app.include_router(directions_router)
-    app.include_router(slots_router)
-    app.include_router(broadcast_router)
-    app.include_router(logs_router)
+    # Initialize scheduler
+    scheduler = await setup_scheduler(bot)
+    scheduler.start()
+    
+    app = build_admin_app(
+        mode="combined",
+        scheduler=scheduler,
+        include_admin=include_admin,
+        bot_mode="webhook" if use_webhook else "polling"
+    )
+    if use_webhook:
+        register_webhook(app, bot, dp, webhook_secret)
     
     # Get port from environment (Railway/Render set PORT)
     port = int(os.environ.get('PORT', settings.ADMIN_PORT))
@@ -384,32 +409,42 @@ async def start_combined():
             logger.error(f"Bot error: {e}", exc_info=True)
     
     try:
-        # Run web server and bot together
-        await asyncio.gather(
-            server.serve(),
-            run_bot()
-        )
+        if use_webhook:
+            # Updates arrive through the web server
+            await server.serve()
+        else:
+            # Run web server and bot together
+            await asyncio.gather(
+                server.serve(),
+                run_bot()
+            )
     except KeyboardInterrupt:
         logger.info("Shutting down...")
     finally:
         scheduler.shutdown()
         await bot.session.close()
+        await dp.storage.close()
+        await pool.close()
         logger.info("Services stopped.")
 
 
 if __name__ == "__main__":
     # Choose which service to run based on command line argument
-    if len(sys.argv) > 1:
-        mode = sys.argv[1].lower()
+    args = [arg.lower() for arg in sys.argv[1:]]
+    no_admin = "--no-admin" in args
+    modes = [arg for arg in args if arg != "--no-admin"]
+    
+    if modes:
+        mode = modes[0]
         if mode == "admin":
             # Run admin panel only
             asyncio.run(start_admin_panel())
         elif mode == "combined":
             # Run both bot and admin panel together (for single-service cloud)
-            asyncio.run(start_combined())
+            asyncio.run(start_combined(include_admin=not no_admin))
         else:
             print(f"Unknown mode: {mode}")
-            print("Usage: python -m app.main [admin|combined]")
+            print("Usage: python -m app.main [admin|combined] [--no-admin]")
             sys.exit(1)
     else:
         # Run bot only (default for local development)
@@ -4,14 +4,55 @@ Morning schedule delivery job.
 Sends daily schedule to all active users at 08:00 MSK.
 """
 
+import asyncio
+from typing import Dict, List, Tuple
+
 from aiogram import Bot
-from datetime import datetime
 
-from app.db import get_connection
-from app.db.queries import get_active_users, get_pairs_by_direction_and_day
-from app.bot.utils import format_schedule_message
-from app.scheduler.utils import send_message_with_retry, log_delivery
+from app.db import pool
+from app.db.models.pair import Pair
+from app.db.models.user import ActiveUser
+from app.db.queries import get_active_users, get_pairs_by_directions_and_day, has_pairs_on_day
+from app.bot.utils import NO_CLASSES_MESSAGE, format_schedule_greeting, format_schedule_body
+from app.scheduler.utils import batch_send, send_and_log, DeliveryLogBuffer
 from app.utils.logger import logger
+from app.utils.timezone import get_current_time_msk
+from app.config import settings
+
+
+def _render_messages(
+    users: List[ActiveUser],
+    pairs_by_direction: Dict[int, List[Tuple[Pair, str, str]]],
+    today: int
+) -> Tuple[Dict[int, str], List[Tuple[int, str]]]:
+    """
+    Render the morning message of every user.
+    
+    Pure string building; runs in a worker thread so the event loop keeps
+    serving updates meanwhile.
+    
+    Returns:
+        Tuple of (tg_id -> message, [(tg_id, error)] for failed users)
+    """
+    # Schedule text depends only on the direction: render it once each
+    bodies = {
+        direction_id: format_schedule_body(pairs)
+        for direction_id, pairs in pairs_by_direction.items()
+    }
+    
+    messages = {}
+    failed = []
+    for user in users:
+        try:
+            messages[user.tg_id] = (
+                format_schedule_greeting(today, user.name)
+                + bodies.get(user.direction_id, NO_CLASSES_MESSAGE)
+            )
+        except Exception as e:
+            logger.error(f"Error formatting schedule for user {user.tg_id}: {e}", exc_info=True)
+            failed.append((user.tg_id, str(e)))
+    
+    return messages, failed
 
 
 async def morning_schedule_job(bot: Bot):
@@ -22,54 +63,49 @@ async def morning_schedule_job(bot: Bot):
     """
     logger.info("Starting morning schedule delivery...")
     
-    conn = await get_connection()
+    # One clock reading (MSK) for the whole job; 0=Monday
+    today = get_current_time_msk().weekday()
+    
+    # Delivery log entries are written once, when the job finishes
+    delivery_log = DeliveryLogBuffer()
     
     try:
-        # Get all active users
-        users = await get_active_users(conn)
-        logger.info(f"Found {len(users)} active users")
-        
-        if not users:
-            logger.info("No active users to send schedule to")
-            return
-        
-        # Get current day of week (0=Monday)
-        today = datetime.now().weekday()
-        
-        successful = 0
-        errors = 0
-        
-        # Send to each user
-        for user in users:
-            try:
-                # Get user's schedule for today
-                pairs = await get_pairs_by_direction_and_day(
-                    conn, user.direction_id, today
-                )
-                
-                # Format message
-                message = format_schedule_message(pairs, today, user.name)
-                
-                # Send message
-                sent = await send_message_with_retry(bot, user.tg_id, message)
-                
-                # Log delivery
-                if sent:
-                    await log_delivery(conn, user.tg_id, 'morning', 'sent')
-                    successful += 1
-                else:
-                    await log_delivery(
-                        conn, user.tg_id, 'morning', 'error',
-                        'Failed after retries'
-                    )
-                    errors += 1
+        async with pool.acquire(read_only=True) as conn:
+            # Get all active users
+            users = await get_active_users(conn)
+            logger.info(f"Found {len(users)} active users")
             
-            except Exception as e:
-                logger.error(f"Error sending to user {user.tg_id}: {e}", exc_info=True)
-                await log_delivery(
-                    conn, user.tg_id, 'morning', 'error', str(e)
+            if not users:
+                logger.info("No active users to send schedule to")
+                return
+            
+            if await has_pairs_on_day(conn, today):
+                # One query for the schedules of all directions involved
+                pairs_by_direction = await get_pairs_by_directions_and_day(
+                    conn, {user.direction_id for user in users}, today
                 )
-                errors += 1
+            else:
+                # Day off for everyone: all users get the no-classes text
+                logger.info("No pairs scheduled today for any direction")
+                pairs_by_direction = {}
+        
+        # Format every message before sending, off the event loop, so the
+        # send phase is nothing but network awaits
+        messages, failed = await asyncio.to_thread(
+            _render_messages, users, pairs_by_direction, today
+        )
+        for tg_id, error in failed:
+            delivery_log.add(tg_id, 'morning', 'error', error)
+        
+        # Send in concurrent batches; each send logs its own delivery
+        successful, errors = await batch_send(
+            bot,
+            list(messages),
+            lambda bot, tg_id: send_and_log(bot, tg_id, messages[tg_id], delivery_log, 'morning'),
+            batch_size=settings.BATCH_SIZE,
+            delay=settings.BATCH_DELAY
+        )
+        errors += len(failed)
         
         logger.info(
             f"Morning schedule delivery completed: "
@@ -80,4 +116,6 @@ async def morning_schedule_job(bot: Bot):
         logger.error(f"Morning schedule job failed: {e}", exc_info=True)
     
     finally:
-        await conn.close()
+        if delivery_log:
+            async with pool.acquire() as conn:
+                await delivery_log.flush(conn)
@@ -4,14 +4,18 @@ Reminder jobs.
 Sends 5-minute reminders before each class.
 """
 
+import logging
+from functools import lru_cache
+
 from aiogram import Bot
 from datetime import datetime, time, timedelta
 
-from app.db import get_connection
-from app.db.queries import get_active_users, get_pairs_by_direction_and_day
+from app.db import pool
+from app.db.queries import get_active_users, get_pair_at_slot
 from app.bot.utils import format_reminder_message
-from app.scheduler.utils import send_message_with_retry, log_delivery
+from app.scheduler.utils import batch_send, send_and_log, DeliveryLogBuffer
 from app.utils.logger import logger
+from app.utils.timezone import get_current_time_msk
 from app.config import settings
 
 
@@ -27,90 +31,64 @@ async def reminder_job(bot: Bot, slot_number: int, start_time: str, end_time: st
     """
     logger.info(f"Starting reminder job for slot {slot_number} ({start_time})")
     
-    conn = await get_connection()
+    # One clock reading (MSK) for the whole job; 0=Monday
+    today = get_current_time_msk().weekday()
+    
+    # Delivery log entries are written once, when the job finishes
+    delivery_log = DeliveryLogBuffer()
     
     try:
-        # Get all active users with reminders enabled
-        all_users = await get_active_users(conn)
-        users = [u for u in all_users if u.remind_before]
-        
-        logger.info(f"Found {len(users)} users with reminders enabled")
-        
-        if not users:
-            logger.info("No users with reminders enabled")
-            return
-        
-        # Get current day of week (0=Monday)
-        today = datetime.now().weekday()
-        logger.info(f"Today is weekday {today} (0=Monday)")
-        
-        successful = 0
-        errors = 0
-        skipped = 0
-        
-        # Send to each user
-        for user in users:
-            try:
-                # Get user's schedule for today
-                pairs = await get_pairs_by_direction_and_day(
-                    conn, user.direction_id, today
-                )
-                
-                logger.debug(
-                    f"User {user.tg_id} (direction {user.direction_id}): "
-                    f"found {len(pairs)} pairs for today"
-                )
+        async with pool.acquire(read_only=True) as conn:
+            logger.info(f"Today is weekday {today} (0=Monday)")
+            
+            # Pairs starting in this slot today, for all directions, in one query
+            slot_pairs = await get_pair_at_slot(conn, None, today, start_time)
+            
+            if not slot_pairs:
+                logger.info(f"No pairs at slot {slot_number} today, nothing to remind")
+                return
+            
+            # Everyone in a direction gets the same reminder: render it once each
+            reminder_texts = {
+                direction_id: format_reminder_message(pair, pair_start, pair_end)
+                for direction_id, (pair, pair_start, pair_end) in slot_pairs.items()
+            }
+            
+            skipped = 0
+            messages = {}
+            # Checked once: skips building per-user debug records when disabled
+            debug_enabled = logger.isEnabledFor(logging.DEBUG)
+            
+            # Active user list is cached, so slots run back to back share it
+            for user in await get_active_users(conn):
+                if not user.remind_before:
+                    continue
                 
-                # Find pair matching this time slot
-                matching_pair = None
-                for pair, pair_start, pair_end in pairs:
-                    logger.debug(
-                        f"Checking pair: {pair.title} at {pair_start} "
-                        f"(looking for {start_time})"
-                    )
-                    if pair_start == start_time:
-                        matching_pair = (pair, pair_start, pair_end)
-                        break
+                # Find the user's pair in this time slot
+                text = reminder_texts.get(user.direction_id)
                 
-                if not matching_pair:
+                if text is None:
                     # User doesn't have class at this slot
-                    logger.debug(
-                        f"User {user.tg_id} has no class at {start_time}, skipping"
-                    )
+                    if debug_enabled:
+                        logger.debug(
+                            "User %s has no class at %s, skipping",
+                            user.tg_id, start_time
+                        )
                     skipped += 1
                     continue
                 
-                pair, pair_start, pair_end = matching_pair
-                logger.info(
-                    f"Sending reminder to user {user.tg_id} for {pair.title} "
-                    f"at {pair_start}"
-                )
-                
-                # Format reminder message
-                message = format_reminder_message(pair, pair_start, pair_end)
-                
-                # Send message
-                sent = await send_message_with_retry(bot, user.tg_id, message)
-                
-                # Log delivery
-                if sent:
-                    await log_delivery(conn, user.tg_id, 'reminder', 'sent')
-                    successful += 1
-                    logger.info(f"Successfully sent reminder to user {user.tg_id}")
-                else:
-                    await log_delivery(
-                        conn, user.tg_id, 'reminder', 'error',
-                        'Failed after retries'
-                    )
-                    errors += 1
-                    logger.error(f"Failed to send reminder to user {user.tg_id}")
-            
-            except Exception as e:
-                logger.error(f"Error sending reminder to user {user.tg_id}: {e}", exc_info=True)
-                await log_delivery(
-                    conn, user.tg_id, 'reminder', 'error', str(e)
-                )
-                errors += 1
+                messages[user.tg_id] = text
+        
+        logger.info(f"Sending {len(messages)} reminders for slot {slot_number}")
+        
+        # Send in concurrent batches; each send logs its own delivery
+        successful, errors = await batch_send(
+            bot,
+            list(messages),
+            lambda bot, tg_id: send_and_log(bot, tg_id, messages[tg_id], delivery_log, 'reminder'),
+            batch_size=settings.BATCH_SIZE,
+            delay=settings.BATCH_DELAY
+        )
         
         logger.info(
             f"Reminder job completed for slot {slot_number}: "
@@ -121,9 +99,16 @@ async def reminder_job(bot: Bot, slot_number: int, start_time: str, end_time: st
         logger.error(f"Reminder job failed for slot {slot_number}: {e}", exc_info=True)
     
     finally:
-        await conn.close()
+        if delivery_log:
+            async with pool.acquire() as conn:
+                await delivery_log.flush(conn)
+
+
+# Date placeholder for time arithmetic; any fixed date works
+_EPOCH = datetime(2000, 1, 1)
 
 
+@lru_cache(maxsize=64)
 def calculate_reminder_time(slot_start: str, minutes_before: int = 5) -> time:
     """
     Calculate reminder time (slot_start - minutes_before).
@@ -136,11 +121,10 @@ def calculate_reminder_time(slot_start: str, minutes_before: int = 5) -> time:
         time object for reminder
     """
     # Parse start time
-    hour, minute = map(int, slot_start.split(':'))
-    slot_time = time(hour, minute)
+    slot_time = time.fromisoformat(slot_start)
     
     # Calculate reminder time
-    slot_datetime = datetime.combine(datetime.today(), slot_time)
+    slot_datetime = datetime.combine(_EPOCH, slot_time)
     reminder_datetime = slot_datetime - timedelta(minutes=minutes_before)
     
     return reminder_datetime.time()
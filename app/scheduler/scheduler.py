@@ -5,27 +5,34 @@ Sets up scheduler with cron jobs for morning messages and reminders.
 """
 
 import asyncio
+from apscheduler.executors.asyncio import AsyncIOExecutor
+from apscheduler.jobstores.memory import MemoryJobStore
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 from aiogram import Bot
 
 from app.config import settings
 from app.scheduler.jobs import morning_schedule_job, reminder_job, calculate_reminder_time
-from app.db import get_connection
+from app.db import pool
 from app.utils.logger import logger
 
 
+# Applied to every job: a delayed or stalled run must never lead to
+# overlapping or repeated deliveries
+JOB_DEFAULTS = {
+    'coalesce': True,  # Run missed fires once, not once per missed fire
+    'max_instances': 1,  # Never run two copies of the same job
+    'misfire_grace_time': settings.SCHEDULER_MISFIRE_GRACE_TIME  # Skip runs later than this
+}
+
+
 async def get_time_slots():
-    """Fetch time slots from database."""
-    conn = await get_connection()
-    try:
-        async with conn.execute(
+    """Fetch time slots from database (rows support slot['start_time'])."""
+    async with pool.acquire(read_only=True) as conn:
+        cursor = await conn.execute(
             "SELECT slot_number, start_time, end_time FROM time_slots ORDER BY slot_number"
-        ) as cursor:
-            rows = await cursor.fetchall()
-            return [dict(row) for row in rows]
-    finally:
-        await conn.close()
+        )
+        return await cursor.fetchall()
 
 
 async def setup_scheduler(bot: Bot) -> AsyncIOScheduler:
@@ -40,8 +47,15 @@ async def setup_scheduler(bot: Bot) -> AsyncIOScheduler:
     """
     logger.info("Initializing scheduler...")
     
-    # Create scheduler with MSK timezone
-    scheduler = AsyncIOScheduler(timezone=settings.TIMEZONE)
+    # Create scheduler with MSK timezone; jobs are rebuilt on every start,
+    # so they are kept in memory only. AsyncIOExecutor runs each job as a
+    # task on the bot's event loop, without a thread pool hop
+    scheduler = AsyncIOScheduler(
+        jobstores={'default': MemoryJobStore()},
+        executors={'default': AsyncIOExecutor()},
+        job_defaults=JOB_DEFAULTS,
+        timezone=settings.TIMEZONE
+    )
     
     # Add morning schedule job (08:00 MSK daily)
     scheduler.add_job(
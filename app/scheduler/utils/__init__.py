@@ -1,6 +1,13 @@
 """Scheduler utilities package."""
 
-from .delivery import batch_send, send_message_with_retry
-from .logging import log_delivery
+from .delivery import batch_send, send_message_with_retry, send_and_log
+from .logging import DeliveryLogBuffer
+from .rate_limit import RateLimiter
 
-__all__ = ['batch_send', 'send_message_with_retry', 'log_delivery']
+__all__ = [
+    'batch_send',
+    'send_message_with_retry',
+    'send_and_log',
+    'DeliveryLogBuffer',
+    'RateLimiter'
+]
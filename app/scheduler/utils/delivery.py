@@ -4,15 +4,27 @@ Batch delivery utility.
 Sends messages in batches with rate limiting to avoid Telegram limits.
 """
 
+from __future__ import annotations
+
 import asyncio
+import random
 from typing import List, Callable, Any
 from aiogram import Bot
-from aiogram.exceptions import TelegramAPIError
+from aiogram.exceptions import TelegramAPIError, TelegramRetryAfter
 
 from app.config import settings
+from app.scheduler.utils.logging import DeliveryLogBuffer
+from app.scheduler.utils.rate_limit import RateLimiter
 from app.utils.logger import logger
 
 
+# Shared by every sender in the process to stay under Telegram's global limit
+GLOBAL_LIMITER = RateLimiter(settings.TG_RPS, 1)
+
+# Upper bound of the backoff between retries after an API error, seconds
+MAX_BACKOFF = 30.0
+
+
 async def batch_send(
     bot: Bot,
     user_ids: List[int],
@@ -26,7 +38,8 @@ async def batch_send(
     Args:
         bot: Bot instance
         user_ids: List of user Telegram IDs
-        message_func: Async function(bot, user_id) that sends message
+        message_func: Async function(bot, user_id) that sends message;
+            an exception or a False result counts as an error
         batch_size: Messages per batch (default from config)
         delay: Delay between batches in seconds (default from config)
     
@@ -52,7 +65,7 @@ async def batch_send(
         
         # Count results
         for result in results:
-            if isinstance(result, Exception):
+            if isinstance(result, Exception) or result is False:
                 errors += 1
             else:
                 successful += 1
@@ -75,6 +88,10 @@ async def send_message_with_retry(
     """
     Send message with retry on failure.
     
+    Sends are paced by GLOBAL_LIMITER. On a 429 the wait requested by
+    Telegram is honoured; other API errors back off exponentially. Small
+    random jitter keeps concurrent senders from retrying in lockstep.
+    
     Args:
         bot: Bot instance
         user_id: User Telegram ID
@@ -90,18 +107,32 @@ async def send_message_with_retry(
     
     for attempt in range(max_retries + 1):
         try:
-            await bot.send_message(
-                chat_id=user_id,
-                text=text,
-                parse_mode=parse_mode
-            )
+            async with GLOBAL_LIMITER:
+                await bot.send_message(
+                    chat_id=user_id,
+                    text=text,
+                    parse_mode=parse_mode
+                )
             return True
         
+        except TelegramRetryAfter as e:
+            logger.warning(
+                f"Rate limited sending to {user_id} (attempt {attempt + 1}), "
+                f"retry after {e.retry_after}s"
+            )
+            
+            if attempt < max_retries:
+                await asyncio.sleep(e.retry_after + random.uniform(0, 0.25))
+            else:
+                logger.error(f"All retry attempts failed for user {user_id}")
+                return False
+        
         except TelegramAPIError as e:
             logger.warning(f"Failed to send to {user_id} (attempt {attempt + 1}): {e}")
             
             if attempt < max_retries:
-                await asyncio.sleep(1)  # Wait before retry
+                # Exponential backoff with jitter
+                await asyncio.sleep(min(MAX_BACKOFF, 2 ** attempt + random.random()))
             else:
                 logger.error(f"All retry attempts failed for user {user_id}")
                 return False
@@ -111,3 +142,37 @@ async def send_message_with_retry(
             return False
     
     return False
+
+
+async def send_and_log(
+    bot: Bot,
+    user_id: int,
+    text: str,
+    delivery_log: DeliveryLogBuffer,
+    message_type: str
+) -> bool:
+    """
+    Send message with retry and record its delivery log entry.
+    
+    Args:
+        bot: Bot instance
+        user_id: User Telegram ID
+        text: Message text
+        delivery_log: Delivery log buffer of the running job
+        message_type: 'morning', 'reminder', 'broadcast'
+    
+    Returns:
+        True if sent successfully, False otherwise
+    """
+    try:
+        sent = await send_message_with_retry(bot, user_id, text)
+    except Exception as e:
+        logger.error(f"Error sending {message_type} to user {user_id}: {e}", exc_info=True)
+        delivery_log.add(user_id, message_type, 'error', str(e))
+        return False
+    
+    if sent:
+        delivery_log.add(user_id, message_type, 'sent')
+    else:
+        delivery_log.add(user_id, message_type, 'error', 'Failed after retries')
+    return sent
@@ -4,37 +4,67 @@ Delivery logging utility.
 Records message delivery status to database.
 """
 
-import aiosqlite
-from datetime import datetime
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, List, Optional, Tuple
 
 from app.utils.logger import logger
 
+if TYPE_CHECKING:
+    import aiosqlite
+
+
+LOG_DELIVERY_SQL = """
+    INSERT INTO delivery_log (user_id, message_type, status, error_message)
+    VALUES (?, ?, ?, ?)
+"""
+
 
-async def log_delivery(
-    conn: aiosqlite.Connection,
-    user_id: int,
-    message_type: str,
-    status: str,
-    error_message: str = None
-):
+class DeliveryLogBuffer:
     """
-    Log message delivery to database.
+    Collects delivery log entries of one job in memory.
     
-    Args:
-        conn: Database connection
-        user_id: User Telegram ID
-        message_type: 'morning', 'reminder', 'broadcast'
-        status: 'sent' or 'error'
-        error_message: Error details if failed
+    The job calls flush() once at the end, so all entries are written with
+    a single executemany and one commit instead of a commit per user.
     """
-    try:
-        await conn.execute(
-            """
-            INSERT INTO delivery_log (user_id, message_type, status, error_message)
-            VALUES (?, ?, ?, ?)
-            """,
-            (user_id, message_type, status, error_message)
-        )
-        await conn.commit()
-    except Exception as e:
-        logger.error(f"Failed to log delivery: {e}")
+    
+    def __init__(self):
+        self.rows: List[Tuple[int, str, str, Optional[str]]] = []
+    
+    def __len__(self) -> int:
+        return len(self.rows)
+    
+    def add(
+        self,
+        user_id: int,
+        message_type: str,
+        status: str,
+        error_message: str = None
+    ):
+        """
+        Record a delivery log entry.
+        
+        Args:
+            user_id: User Telegram ID
+            message_type: 'morning', 'reminder', 'broadcast'
+            status: 'sent' or 'error'
+            error_message: Error details if failed
+        """
+        self.rows.append((user_id, message_type, status, error_message))
+    
+    async def flush(self, conn: aiosqlite.Connection):
+        """
+        Write all recorded entries in one transaction.
+        
+        Args:
+            conn: Database connection
+        """
+        if not self.rows:
+            return
+        
+        try:
+            await conn.executemany(LOG_DELIVERY_SQL, self.rows)
+            await conn.commit()
+            self.rows.clear()
+        except Exception as e:
+            logger.error(f"Failed to log {len(self.rows)} deliveries: {e}")
@@ -0,0 +1,47 @@
+"""
+Outgoing message rate limiting.
+
+Telegram allows about 30 messages per second per bot; going over that
+returns 429 errors that then have to be waited out. RateLimiter paces
+senders up front instead.
+"""
+
+import asyncio
+from typing import Optional
+
+
+class RateLimiter:
+    """
+    Async rate limiter allowing `rate` acquisitions per `period` seconds.
+
+    Callers are spaced `period / rate` apart in arrival order, so no
+    window of `period` seconds sees more than `rate` calls. A call that
+    arrives after an idle gap runs immediately; there is no burst.
+
+    Usage:
+        async with limiter:
+            await bot.send_message(...)
+    """
+
+    def __init__(self, rate: float, period: float = 1.0):
+        self._interval = period / rate
+        self._next_at: Optional[float] = None
+
+    async def acquire(self):
+        """Wait until the next call is allowed."""
+        now = asyncio.get_running_loop().time()
+        # Earliest moment this call may run: one interval after the last one
+        start_at = now
+        if self._next_at is not None and self._next_at > start_at:
+            start_at = self._next_at
+        self._next_at = start_at + self._interval
+
+        if start_at > now:
+            await asyncio.sleep(start_at - now)
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
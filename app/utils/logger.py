@@ -1,23 +1,37 @@
 """
 Logging configuration for the application.
 
-Sets up rotating file handler and console output.
+Sets up rotating file handler and console output. Both run on a background
+thread fed through a queue, so logging calls never block the event loop on
+disk or console I/O.
 """
 
+import atexit
 import logging
+import queue
 import sys
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
+from typing import Optional
 from app.config import settings
 
 
+# Background thread writing queued records to the real handlers
+_listener: Optional[QueueListener] = None
+
+
 def setup_logging():
     """
     Configure application logging with file and console handlers.
     
     - File handler: Rotating log file (max 10MB, 5 backups)
     - Console handler: Stdout with colored output (if available)
+    
+    The root logger only gets a QueueHandler; a QueueListener thread
+    passes records on to the handlers above.
     """
+    global _listener
+    
     # Ensure logs directory exists
     log_path = Path(settings.LOG_FILE_PATH)
     log_path.parent.mkdir(parents=True, exist_ok=True)
@@ -28,6 +42,8 @@ def setup_logging():
     
     # Clear existing handlers
     logger.handlers.clear()
+    if _listener is not None:
+        _listener.stop()
     
     # Format
     formatter = logging.Formatter(
@@ -44,13 +60,20 @@ def setup_logging():
     )
     file_handler.setLevel(logging.DEBUG)
     file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
     
     # Console handler
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(logging.INFO if not settings.DEBUG else logging.DEBUG)
     console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
+    
+    # Callers only enqueue records; formatting and writes happen on the
+    # listener thread
+    log_queue = queue.Queue(-1)
+    logger.addHandler(QueueHandler(log_queue))
+    _listener = QueueListener(
+        log_queue, file_handler, console_handler, respect_handler_level=True
+    )
+    _listener.start()
     
     # Silence noisy loggers in production
     if not settings.DEBUG:
@@ -63,5 +86,15 @@ def setup_logging():
     return logger
 
 
+def stop_logging():
+    """Flush queued records and stop the listener thread."""
+    global _listener
+    
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
 # Initialize logger
 logger = setup_logging()
+atexit.register(stop_logging)
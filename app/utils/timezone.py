@@ -13,6 +13,16 @@ from app.config import settings
 MSK = ZoneInfo(settings.TIMEZONE)
 UTC = ZoneInfo("UTC")
 
+WEEKDAYS_RU = (
+    "Понедельник",
+    "Вторник",
+    "Среда",
+    "Четверг",
+    "Пятница",
+    "Суббота",
+    "Воскресенье"
+)
+
 
 def get_current_time_msk() -> datetime:
     """
@@ -92,13 +102,4 @@ def get_weekday_name_ru(day_of_week: int) -> str:
     Returns:
         str: Russian weekday name
     """
-    weekdays = [
-        "Понедельник",
-        "Вторник",
-        "Среда",
-        "Четверг",
-        "Пятница",
-        "Суббота",
-        "Воскресенье"
-    ]
-    return weekdays[day_of_week]
+    return WEEKDAYS_RU[day_of_week]
@@ -13,17 +13,218 @@ Options:
 """
 
 import argparse
+import errno
 import shutil
 import os
+import re
+import sqlite3
 import sys
 from datetime import datetime
 from pathlib import Path
+from typing import List, Optional, Tuple
 
 # Add project root to path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 
+# Backup file names: <db name>_backup_<_TS_FMT timestamp>.db
+_TS_FMT = "%Y%m%d_%H%M%S"
+_BACKUP_RE = re.compile(r"(?P<db_name>.+)_backup_\d{8}_\d{6}\.db")
+
+# Linux FICLONE ioctl (reflink: copy-on-write clone on btrfs/xfs)
+FICLONE = 0x40049409
+
+# Buffer for the plain read/write fallback
+COPY_BUFFER_SIZE = 1024 * 1024
+
+# Errors meaning "this copy method isn't supported here, try the next one"
+_UNSUPPORTED_ERRNOS = {
+    errno.EXDEV, errno.ENOTSUP, errno.EOPNOTSUPP, errno.EINVAL,
+    errno.ENOSYS, errno.ENOTTY, errno.EBADF, errno.EPERM,
+}
+
+
+def _fadvise(fd: int, advice: str):
+    """Give the kernel a page cache hint (os.POSIX_FADV_*), where supported."""
+    if hasattr(os, 'posix_fadvise') and hasattr(os, advice):
+        try:
+            os.posix_fadvise(fd, 0, 0, getattr(os, advice))
+        except OSError:
+            pass
+
+
+def _fsync_dir(path: Path):
+    """Make a directory's entries (new or renamed files) durable."""
+    if hasattr(os, 'O_DIRECTORY'):
+        dir_fd = os.open(path, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+def _fast_copy(src, dst) -> int:
+    """
+    Copy a file using the cheapest method the platform supports.
+    
+    Tries, in order: reflink clone (no data copied), copy_file_range and
+    sendfile (in-kernel copy), then a read/write loop with a 1 MiB buffer.
+    File metadata is copied afterwards, like shutil.copy2. The copy is
+    fsynced, then dropped from the page cache so it doesn't evict the live
+    database.
+    
+    Args:
+        src: Source file path
+        dst: Destination file path
+    
+    Returns:
+        Number of bytes copied
+    """
+    with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+        src_fd, dst_fd = fsrc.fileno(), fdst.fileno()
+        size = os.fstat(src_fd).st_size
+        copied = False
+        _fadvise(src_fd, 'POSIX_FADV_SEQUENTIAL')
+        
+        try:
+            import fcntl
+            fcntl.ioctl(dst_fd, FICLONE, src_fd)
+            copied = True
+        except (ImportError, OSError):
+            pass
+        
+        for kernel_copy in ('copy_file_range', 'sendfile'):
+            if copied or not hasattr(os, kernel_copy):
+                continue
+            offset = 0
+            try:
+                while offset < size:
+                    if kernel_copy == 'copy_file_range':
+                        n = os.copy_file_range(src_fd, dst_fd, size - offset)
+                    else:
+                        n = os.sendfile(dst_fd, src_fd, offset, size - offset)
+                    if n == 0:
+                        break
+                    offset += n
+                copied = True
+            except OSError as e:
+                if e.errno not in _UNSUPPORTED_ERRNOS or offset:
+                    raise
+        
+        if not copied:
+            buffer = bytearray(COPY_BUFFER_SIZE)
+            view = memoryview(buffer)
+            while True:
+                n = fsrc.readinto(buffer)
+                if not n:
+                    break
+                fdst.write(view[:n])
+        
+        fdst.flush()
+        # Python has no sync_file_range(), and it wouldn't flush metadata
+        # anyway; fsync is what makes the copy durable
+        os.fsync(dst_fd)
+        _fadvise(dst_fd, 'POSIX_FADV_DONTNEED')
+    
+    shutil.copystat(src, dst)
+    _fsync_dir(Path(dst).resolve().parent)
+    return size
+
+
+# Pages copied per step of the online backup
+BACKUP_PAGES_PER_STEP = 1024
+
+
+def _checkpoint_wal(db_path: str) -> bool:
+    """
+    Merge the WAL into the main database file and truncate it.
+    
+    The online backup reads WAL content anyway; checkpointing first means
+    the file-copy fallback is consistent too, and the WAL starts empty.
+    A no-op for databases not in WAL mode.
+    
+    Args:
+        db_path: Database path
+    
+    Returns:
+        True if every WAL frame is now in the main database file
+    """
+    conn = sqlite3.connect(db_path)
+    try:
+        busy, log_frames, checkpointed = conn.execute(
+            "PRAGMA wal_checkpoint(TRUNCATE)"
+        ).fetchone()
+    finally:
+        conn.close()
+    # Not in WAL mode reports (0, -1, -1): nothing left outside the file
+    return busy == 0 and log_frames == checkpointed
+
+
+def _sqlite_backup(db_path: str, backup_path: Path) -> int:
+    """
+    Copy a live database with SQLite's online backup API.
+    
+    Pages go through SQLite's own locking, so the copy is a consistent
+    snapshot even while the bot writes (WAL content included). The backup
+    is fsynced before returning.
+    
+    Args:
+        db_path: Source database path
+        backup_path: Destination file path
+    
+    Returns:
+        Size of the backup in bytes
+    """
+    src = sqlite3.connect(db_path)
+    try:
+        dst = sqlite3.connect(str(backup_path))
+        try:
+            src.backup(dst, pages=BACKUP_PAGES_PER_STEP, sleep=0)
+            page_count = dst.execute("PRAGMA page_count").fetchone()[0]
+            page_size = dst.execute("PRAGMA page_size").fetchone()[0]
+        finally:
+            dst.close()
+    finally:
+        src.close()
+    
+    # Make the file and its directory entry durable
+    with open(backup_path, 'rb') as f:
+        os.fsync(f.fileno())
+        # Pages are clean now, so this actually frees them
+        _fadvise(f.fileno(), 'POSIX_FADV_DONTNEED')
+    _fsync_dir(backup_path.parent)
+    
+    return page_count * page_size
+
+
+def _sqlite_restore(backup_path: str, db_path: str):
+    """
+    Copy a backup into the live database with SQLite's backup API.
+    
+    Writing through SQLite keeps the database's own WAL and shared-memory
+    files consistent with the restored content, which a plain file copy
+    over a WAL-mode database would not. The WAL is checkpointed afterwards
+    so the main file holds the whole restored database.
+    
+    Args:
+        backup_path: Backup file path
+        db_path: Database path to restore into
+    """
+    src = sqlite3.connect(f"file:{Path(backup_path).resolve()}?mode=ro", uri=True)
+    try:
+        dst = sqlite3.connect(db_path)
+        try:
+            src.backup(dst, pages=BACKUP_PAGES_PER_STEP, sleep=0)
+        finally:
+            dst.close()
+    finally:
+        src.close()
+    
+    if not _checkpoint_wal(db_path):
+        print("   ⚠️ Restored data is still partly in the WAL (database busy)")
+
+
 def get_db_path() -> str:
     """Get database path from environment or default."""
     from dotenv import load_dotenv
@@ -54,21 +255,40 @@ def create_backup(output_dir: str = "backups", keep: int = 7) -> str:
     output_path.mkdir(parents=True, exist_ok=True)
     
     # Generate backup filename with timestamp
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    timestamp = datetime.now().strftime(_TS_FMT)
     db_name = Path(db_path).stem
     backup_name = f"{db_name}_backup_{timestamp}.db"
     backup_path = output_path / backup_name
     
-    # Copy database file
+    # Copy database
     print(f"📦 Creating backup...")
     print(f"   Source: {db_path}")
     print(f"   Destination: {backup_path}")
     
     try:
-        shutil.copy2(db_path, backup_path)
+        try:
+            checkpointed = _checkpoint_wal(db_path)
+        except sqlite3.Error as e:
+            # The backup below still sees WAL content; only the fallback may not
+            print(f"   ⚠️ WAL checkpoint failed: {e}")
+            checkpointed = False
+        
+        try:
+            size = _sqlite_backup(db_path, backup_path)
+        except sqlite3.Error as e:
+            # A file copy only holds every write once the WAL is checkpointed
+            if not checkpointed:
+                backup_path.unlink(missing_ok=True)
+                raise RuntimeError(
+                    f"online backup failed ({e}) and the WAL could not be "
+                    f"checkpointed, so a file copy would miss recent writes"
+                ) from e
+            # Not readable as SQLite (e.g. locked or damaged): plain file copy
+            print(f"   ⚠️ Online backup failed ({e}), copying file instead")
+            size = _fast_copy(db_path, backup_path)
         
-        # Get file size
-        size_mb = os.path.getsize(backup_path) / (1024 * 1024)
+        # Size as reported by the copy; no extra stat of the backup
+        size_mb = size / (1024 * 1024)
         print(f"✅ Backup created successfully ({size_mb:.2f} MB)")
         
     except Exception as e:
@@ -82,6 +302,31 @@ def create_backup(output_dir: str = "backups", keep: int = 7) -> str:
     return str(backup_path)
 
 
+def _scan_backups(output_dir: Path, db_name: Optional[str] = None) -> List[Tuple[float, int, str]]:
+    """
+    Find backup files in one directory pass.
+    
+    Args:
+        output_dir: Directory containing backups
+        db_name: Only include backups of this database (default: all)
+    
+    Returns:
+        (mtime, size, file name) tuples, newest first
+    """
+    with os.scandir(output_dir) as it:
+        entries = []
+        for entry in it:
+            match = _BACKUP_RE.fullmatch(entry.name)
+            if match is None or (db_name is not None and match['db_name'] != db_name):
+                continue
+            if entry.is_file():
+                stat = entry.stat()  # One stat per file, reused for sort and output
+                entries.append((stat.st_mtime, stat.st_size, entry.name))
+    
+    entries.sort(reverse=True)
+    return entries
+
+
 def cleanup_old_backups(output_dir: Path, db_name: str, keep: int):
     """
     Remove old backups, keeping only the most recent ones.
@@ -91,24 +336,20 @@ def cleanup_old_backups(output_dir: Path, db_name: str, keep: int):
         db_name: Database name prefix
         keep: Number of backups to keep
     """
-    # Find all backups
-    pattern = f"{db_name}_backup_*.db"
-    backups = list(output_dir.glob(pattern))
-    
-    # Sort by modification time (newest first)
-    backups.sort(key=lambda f: f.stat().st_mtime, reverse=True)
+    # Find all backups, newest first
+    backups = _scan_backups(output_dir, db_name)
     
     # Remove old backups
     if len(backups) > keep:
         old_backups = backups[keep:]
         print(f"🗑️  Cleaning up {len(old_backups)} old backup(s)...")
         
-        for backup in old_backups:
+        for _, _, name in old_backups:
             try:
-                backup.unlink()
-                print(f"   Deleted: {backup.name}")
+                (output_dir / name).unlink()
+                print(f"   Deleted: {name}")
             except Exception as e:
-                print(f"   ⚠️ Failed to delete {backup.name}: {e}")
+                print(f"   ⚠️ Failed to delete {name}: {e}")
 
 
 def list_backups(output_dir: str = "backups"):
@@ -119,23 +360,20 @@ def list_backups(output_dir: str = "backups"):
         print("No backups found.")
         return
     
-    backups = list(output_path.glob("*_backup_*.db"))
+    # Newest first
+    backups = _scan_backups(output_path)
     
     if not backups:
         print("No backups found.")
         return
     
-    # Sort by modification time
-    backups.sort(key=lambda f: f.stat().st_mtime, reverse=True)
-    
     print(f"\n📁 Backups in {output_dir}/:")
     print("-" * 60)
     
-    for backup in backups:
-        stat = backup.stat()
-        size_mb = stat.st_size / (1024 * 1024)
-        mtime = datetime.fromtimestamp(stat.st_mtime).strftime("%Y-%m-%d %H:%M:%S")
-        print(f"  {backup.name} ({size_mb:.2f} MB) - {mtime}")
+    for mtime, size, name in backups:
+        size_mb = size / (1024 * 1024)
+        mtime_str = datetime.fromtimestamp(mtime).strftime("%Y-%m-%d %H:%M:%S")
+        print(f"  {name} ({size_mb:.2f} MB) - {mtime_str}")
     
     print("-" * 60)
     print(f"Total: {len(backups)} backup(s)")
@@ -161,17 +399,16 @@ def restore_backup(backup_path: str, force: bool = False):
             print("Restore cancelled.")
             return
     
-    # Create backup of current database before restore
-    if os.path.exists(db_path):
-        pre_restore_backup = f"{db_path}.pre_restore"
-        print(f"📦 Backing up current database to {pre_restore_backup}")
-        shutil.copy2(db_path, pre_restore_backup)
-    
-    # Restore from backup
-    print(f"🔄 Restoring from {backup_path}...")
-    
     try:
-        shutil.copy2(backup_path, db_path)
+        # Create backup of current database before restore
+        if os.path.exists(db_path):
+            pre_restore_backup = Path(f"{db_path}.pre_restore")
+            print(f"📦 Backing up current database to {pre_restore_backup}")
+            _sqlite_backup(db_path, pre_restore_backup)
+        
+        # Restore from backup
+        print(f"🔄 Restoring from {backup_path}...")
+        _sqlite_restore(backup_path, db_path)
         print(f"✅ Database restored successfully!")
     except Exception as e:
         print(f"❌ Restore failed: {e}")
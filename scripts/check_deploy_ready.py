@@ -2,45 +2,60 @@
 """
 Final deployment readiness check script.
 Verifies all components are working correctly before deployment.
+
+The checks are independent, so they run concurrently (file checks on
+worker threads; module imports in order on the main thread); results are
+printed in a fixed order.
 """
 import asyncio
+import importlib
+import os
 import sys
+from functools import lru_cache
 from pathlib import Path
+from typing import FrozenSet, List, NamedTuple, Tuple
 
 # Add project root to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
 
 
-async def check_all():
-    """Run all checks."""
-    print("=" * 60)
-    print("🚀 AGU ScheduleBot - Deployment Readiness Check")
-    print("=" * 60)
-    
-    all_passed = True
-    
-    # 1. Check database
-    print("\n📊 1. Database Check...")
+class CheckResult(NamedTuple):
+    """Outcome of one check section."""
+    title: str
+    ok: bool
+    lines: List[str]
+
+
+async def _check_db() -> CheckResult:
+    """1. Time slots and directions are seeded."""
+    title = "📊 1. Database Check..."
     try:
-        import aiosqlite
-        db_path = Path(__file__).parent.parent / "data" / "schedule.db"
-        async with aiosqlite.connect(db_path) as db:
-            cursor = await db.execute("SELECT COUNT(*) FROM time_slots")
-            slots = (await cursor.fetchone())[0]
-            cursor = await db.execute("SELECT COUNT(*) FROM directions")
-            directions = (await cursor.fetchone())[0]
-            
-            if slots == 5 and directions >= 10:
-                print(f"   ✅ Database OK: {slots} time slots, {directions} directions")
-            else:
-                print(f"   ❌ Database issue: {slots} time slots, {directions} directions")
-                all_passed = False
+        # Importing app.db also loads the settings; a config error fails here
+        # and again, with its own message, in the configuration check
+        from app.db import get_connection, release_connection
+        conn = await get_connection()
     except Exception as e:
-        print(f"   ❌ Database error: {e}")
-        all_passed = False
+        return CheckResult(title, False, [f"❌ Database error: {e}"])
     
-    # 2. Check config
-    print("\n⚙️ 2. Configuration Check...")
+    try:
+        cursor = await conn.execute("SELECT COUNT(*) FROM time_slots")
+        slots = (await cursor.fetchone())[0]
+        cursor = await conn.execute("SELECT COUNT(*) FROM directions")
+        directions = (await cursor.fetchone())[0]
+        
+        if slots == 5 and directions >= 10:
+            return CheckResult(title, True, [f"✅ Database OK: {slots} time slots, {directions} directions"])
+        return CheckResult(title, False, [f"❌ Database issue: {slots} time slots, {directions} directions"])
+    except Exception as e:
+        return CheckResult(title, False, [f"❌ Database error: {e}"])
+    finally:
+        await release_connection(conn)
+
+
+def _check_config() -> CheckResult:
+    """2. Required settings are present and sane."""
+    title = "⚙️ 2. Configuration Check..."
     try:
         from app.config import settings
         checks = [
@@ -50,116 +65,161 @@ async def check_all():
             ("SECRET_KEY", len(settings.SECRET_KEY) >= 32),
             ("TIMEZONE", settings.TIMEZONE == "Europe/Moscow"),
         ]
-        for name, valid in checks:
-            if valid:
-                print(f"   ✅ {name}: OK")
-            else:
-                print(f"   ❌ {name}: Invalid")
-                all_passed = False
-    except Exception as e:
-        print(f"   ❌ Config error: {e}")
-        all_passed = False
-    
-    # 3. Check bot imports
-    print("\n🤖 3. Bot Modules Check...")
-    try:
-        from app.bot.handlers import start, registration, settings, common
-        from app.scheduler.scheduler import setup_scheduler
-        from app.scheduler.jobs.morning_message import morning_schedule_job
-        from app.scheduler.jobs.reminders import reminder_job
-        print("   ✅ All bot modules import successfully")
     except Exception as e:
-        print(f"   ❌ Import error: {e}")
-        all_passed = False
+        return CheckResult(title, False, [f"❌ Config error: {e}"])
     
-    # 4. Check admin imports
-    print("\n🖥️ 4. Admin Panel Modules Check...")
+    lines = [f"✅ {name}: OK" if valid else f"❌ {name}: Invalid" for name, valid in checks]
+    return CheckResult(title, all(valid for _, valid in checks), lines)
+
+
+BOT_MODULES = (
+    "app.bot.handlers.start",
+    "app.bot.handlers.registration",
+    "app.bot.handlers.settings",
+    "app.bot.handlers.common",
+    "app.scheduler.scheduler",
+    "app.scheduler.jobs.morning_message",
+    "app.scheduler.jobs.reminders",
+)
+
+ADMIN_MODULES = (
+    "app.admin.routes",
+    "app.admin.pairs",
+    "app.admin.directions",
+    "app.admin.slots",
+    "app.admin.broadcast",
+    "app.admin.logs",
+)
+
+
+async def _check_modules(title: str, modules: Tuple[str, ...], noun: str) -> CheckResult:
+    """Import modules one after another, skipping ones already loaded."""
+    # Imports run on the event loop thread: module code (settings, logger,
+    # routers) isn't written to be executed concurrently from several threads
+    for name in modules:
+        if name in sys.modules:
+            continue
+        try:
+            importlib.import_module(name)
+        except Exception as e:
+            return CheckResult(title, False, [f"❌ Import error: {e}"])
+    return CheckResult(title, True, [f"✅ All {noun} modules import successfully"])
+
+
+async def _check_bot_modules() -> CheckResult:
+    """3. Bot and scheduler modules import."""
+    return await _check_modules("🤖 3. Bot Modules Check...", BOT_MODULES, "bot")
+
+
+async def _check_admin_modules() -> CheckResult:
+    """4. Admin panel routers import."""
+    return await _check_modules("🖥️ 4. Admin Panel Modules Check...", ADMIN_MODULES, "admin")
+
+
+@lru_cache(maxsize=None)
+def _dir_entries(directory: Path) -> FrozenSet[str]:
+    """Names in a directory, read with one scandir instead of a stat per file."""
     try:
-        from app.admin.routes import router as admin_router
-        from app.admin.pairs import router as pairs_router
-        from app.admin.directions import router as directions_router
-        from app.admin.slots import router as slots_router
-        from app.admin.broadcast import router as broadcast_router
-        from app.admin.logs import router as logs_router
-        print("   ✅ All admin modules import successfully")
-    except Exception as e:
-        print(f"   ❌ Import error: {e}")
-        all_passed = False
-    
-    # 5. Check templates
-    print("\n📄 5. Templates Check...")
-    template_dir = Path(__file__).parent.parent / "templates"
-    required_templates = [
-        "base.html", "login.html", "dashboard.html",
-        "pairs_list.html", "pair_form.html",
-        "directions_list.html", "direction_form.html",
-        "slots_list.html", "slot_form.html",
-        "broadcast.html", "logs.html",
-        "errors/404.html", "errors/500.html"
-    ]
-    missing = []
-    for t in required_templates:
-        if not (template_dir / t).exists():
-            missing.append(t)
-    
-    if not missing:
-        print(f"   ✅ All {len(required_templates)} templates present")
-    else:
-        print(f"   ❌ Missing templates: {', '.join(missing)}")
-        all_passed = False
-    
-    # 6. Check deploy files
-    print("\n📦 6. Deployment Files Check...")
-    deploy_dir = Path(__file__).parent.parent / "deploy"
-    required_deploy = [
-        "schedulebot.service",
-        "schedulebot-admin.service",
-        "nginx.conf",
-        "install.sh"
-    ]
+        with os.scandir(directory) as it:
+            return frozenset(entry.name for entry in it)
+    except (FileNotFoundError, NotADirectoryError):
+        return frozenset()
+
+
+def _check_files(title: str, base_dir: Path, required: List[str], noun: str, short_noun: str) -> CheckResult:
+    """Check that all required files exist under base_dir."""
     missing = []
-    for f in required_deploy:
-        if not (deploy_dir / f).exists():
-            missing.append(f)
+    for name in required:
+        # Nested names ("errors/404.html") are looked up in their own directory
+        path = base_dir / name
+        if path.name not in _dir_entries(path.parent):
+            missing.append(name)
     
     if not missing:
-        print(f"   ✅ All {len(required_deploy)} deployment files present")
-    else:
-        print(f"   ❌ Missing deploy files: {', '.join(missing)}")
-        all_passed = False
-    
-    # 7. Check scripts
-    print("\n🔧 7. Utility Scripts Check...")
-    scripts_dir = Path(__file__).parent
-    required_scripts = ["backup_db.py", "check_db.py", "check_scheduler.py"]
-    missing = []
-    for s in required_scripts:
-        if not (scripts_dir / s).exists():
-            missing.append(s)
+        return CheckResult(title, True, [f"✅ All {len(required)} {noun} present"])
+    return CheckResult(title, False, [f"❌ Missing {short_noun}: {', '.join(missing)}"])
+
+
+def _check_templates() -> CheckResult:
+    """5. Admin panel templates."""
+    return _check_files(
+        "📄 5. Templates Check...",
+        PROJECT_ROOT / "templates",
+        [
+            "base.html", "login.html", "dashboard.html",
+            "pairs_list.html", "pair_form.html",
+            "directions_list.html", "direction_form.html",
+            "slots_list.html", "slot_form.html",
+            "broadcast.html", "logs.html",
+            "errors/404.html", "errors/500.html"
+        ],
+        "templates", "templates"
+    )
+
+
+def _check_deploy_files() -> CheckResult:
+    """6. Deployment configuration."""
+    return _check_files(
+        "📦 6. Deployment Files Check...",
+        PROJECT_ROOT / "deploy",
+        [
+            "schedulebot.service",
+            "schedulebot-admin.service",
+            "nginx.conf",
+            "install.sh"
+        ],
+        "deployment files", "deploy files"
+    )
+
+
+def _check_scripts() -> CheckResult:
+    """7. Utility scripts."""
+    return _check_files(
+        "🔧 7. Utility Scripts Check...",
+        PROJECT_ROOT / "scripts",
+        ["backup_db.py", "check_db.py", "check_scheduler.py"],
+        "utility scripts", "scripts"
+    )
+
+
+def _check_docs() -> CheckResult:
+    """8. Documentation."""
+    return _check_files(
+        "📚 8. Documentation Check...",
+        PROJECT_ROOT / "Docs",
+        [
+            "Implementation.md", "PRD.md", "TechStack.md",
+            "DEPLOYMENT.md", "USER_GUIDE.md", "ADMIN_GUIDE.md"
+        ],
+        "documentation files", "docs"
+    )
+
+
+async def check_all():
+    """Run all checks."""
+    print("=" * 60)
+    print("🚀 AGU ScheduleBot - Deployment Readiness Check")
+    print("=" * 60)
     
-    if not missing:
-        print(f"   ✅ All {len(required_scripts)} utility scripts present")
-    else:
-        print(f"   ❌ Missing scripts: {', '.join(missing)}")
-        all_passed = False
+    # The database check is listed first, so it imports app.db (and the
+    # settings) before any check starts on a worker thread
+    results = await asyncio.gather(
+        _check_db(),
+        asyncio.to_thread(_check_config),
+        _check_bot_modules(),
+        _check_admin_modules(),
+        asyncio.to_thread(_check_templates),
+        asyncio.to_thread(_check_deploy_files),
+        asyncio.to_thread(_check_scripts),
+        asyncio.to_thread(_check_docs),
+    )
     
-    # 8. Check documentation
-    print("\n📚 8. Documentation Check...")
-    docs_dir = Path(__file__).parent.parent / "Docs"
-    required_docs = [
-        "Implementation.md", "PRD.md", "TechStack.md",
-        "DEPLOYMENT.md", "USER_GUIDE.md", "ADMIN_GUIDE.md"
-    ]
-    missing = []
-    for d in required_docs:
-        if not (docs_dir / d).exists():
-            missing.append(d)
+    for result in results:
+        print(f"\n{result.title}")
+        for line in result.lines:
+            print(f"   {line}")
     
-    if not missing:
-        print(f"   ✅ All {len(required_docs)} documentation files present")
-    else:
-        print(f"   ❌ Missing docs: {', '.join(missing)}")
-        all_passed = False
+    all_passed = all(result.ok for result in results)
     
     # Summary
     print("\n" + "=" * 60)
@@ -173,5 +233,8 @@ async def check_all():
 
 
 if __name__ == "__main__":
+    # Block-buffer the report: written out in a few large writes at exit
+    # instead of one per print()
+    sys.stdout.reconfigure(line_buffering=False, write_through=False)
     success = asyncio.run(check_all())
     sys.exit(0 if success else 1)
@@ -19,6 +19,7 @@ async def test_scheduler():
     
     # Load config
     from app.config import settings
+    from app.scheduler.jobs import calculate_reminder_time
     print(f"\n📍 Timezone: {settings.TIMEZONE}")
     print(f"⏰ Morning message time: {settings.MORNING_MESSAGE_HOUR}:{settings.MORNING_MESSAGE_MINUTE:02d}")
     print(f"🔔 Reminder minutes before: {settings.REMINDER_MINUTES_BEFORE}")
@@ -49,23 +50,19 @@ async def test_scheduler():
     )
     print(f"\n✅ Morning job: {settings.MORNING_MESSAGE_HOUR}:{settings.MORNING_MESSAGE_MINUTE:02d} MSK")
     
+    # Reminder times for all slots first (same calculation the real
+    # scheduler uses), then register the jobs
+    reminder_times = [
+        calculate_reminder_time(slot[2], settings.REMINDER_MINUTES_BEFORE)
+        for slot in slots
+    ]
+    
     # Add reminder jobs for each slot
-    for slot in slots:
+    for slot, reminder_time in zip(slots, reminder_times):
         # Unpack based on actual columns: id, slot_number, start_time, end_time, created_at
-        slot_id = slot[0]
-        slot_number = slot[1]
-        start_time = slot[2]
-        end_time = slot[3]
-        
-        # Parse start time
-        hours, minutes = map(int, start_time.split(":"))
-        
-        # Calculate reminder time (5 minutes before)
-        reminder_minutes = minutes - settings.REMINDER_MINUTES_BEFORE
-        reminder_hours = hours
-        if reminder_minutes < 0:
-            reminder_minutes += 60
-            reminder_hours -= 1
+        slot_id, slot_number, start_time = slot[0], slot[1], slot[2]
+        reminder_hours = reminder_time.hour
+        reminder_minutes = reminder_time.minute
         
         scheduler.add_job(
             lambda: None,  # dummy function
@@ -98,5 +95,8 @@ async def test_scheduler():
     return len(jobs) == 6
 
 if __name__ == "__main__":
+    # Block-buffer the report: written out in a few large writes at exit
+    # instead of one per print()
+    sys.stdout.reconfigure(line_buffering=False, write_through=False)
     success = asyncio.run(test_scheduler())
     sys.exit(0 if success else 1)
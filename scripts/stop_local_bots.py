@@ -5,28 +5,125 @@ Stop all local bot instances and clear potential conflicts.
 This script helps resolve Telegram bot conflicts by stopping local instances.
 """
 
+import asyncio
+import shutil
+import signal
+import socket
 import subprocess
 import sys
 import os
 
+import httpx
 
-def run_command(cmd, shell=True):
-    """Run command and return output."""
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _load_bot_token():
+    """Bot token from the environment, else from app config if it loads."""
+    token = os.environ.get('BOT_TOKEN')
+    if not token:
+        try:
+            from app.config import settings
+            token = settings.BOT_TOKEN
+        except Exception:
+            pass
+    return token
+
+
+# Resolved once at import
+BOT_TOKEN = _load_bot_token()
+
+
+def run_command(argv):
+    """Run a command (argument list, no shell) and return output."""
+    # Resolve the executable ourselves: no intermediate sh/cmd.exe process
+    executable = shutil.which(argv[0])
+    if executable is None:
+        return -1, "", f"{argv[0]}: command not found"
+    
     try:
-        result = subprocess.run(cmd, shell=shell, capture_output=True, text=True)
+        result = subprocess.run([executable, *argv[1:]], capture_output=True, text=True)
         return result.returncode, result.stdout, result.stderr
     except Exception as e:
         return -1, "", str(e)
 
 
+def _is_bot_cmdline(cmdline) -> bool:
+    """Check whether a command line looks like a bot instance."""
+    return any('app.main' in arg or 'schedulebot' in arg for arg in cmdline)
+
+
+def _kill_with_psutil(psutil):
+    """Find and kill bot processes in-process, without spawning commands."""
+    processes = []
+    for process in psutil.process_iter(['pid', 'name', 'cmdline']):
+        name = (process.info['name'] or '').lower()
+        if (
+            'python' in name
+            and process.info['pid'] != os.getpid()
+            and _is_bot_cmdline(process.info['cmdline'] or [])
+        ):
+            processes.append(process)
+    
+    if not processes:
+        print("✅ Активных процессов бота не найдено")
+        return
+    
+    print(f"📍 Найдено {len(processes)} процессов бота")
+    for process in processes:
+        print(f"   Останавливаю PID {process.pid}...")
+        try:
+            process.kill()
+        except psutil.Error:
+            pass
+
+
+def _kill_with_procfs():
+    """Find and kill bot processes by reading /proc/<pid>/cmdline (Linux)."""
+    pids = []
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit() or int(entry) == os.getpid():
+            continue
+        try:
+            with open(f'/proc/{entry}/cmdline', 'rb') as f:
+                cmdline = f.read().decode(errors='ignore').split('\0')
+        except OSError:
+            continue  # Process exited or is not readable
+        if any('python' in arg for arg in cmdline) and _is_bot_cmdline(cmdline):
+            pids.append(int(entry))
+    
+    if not pids:
+        print("✅ Активных процессов бота не найдено")
+        return
+    
+    print(f"📍 Найдено {len(pids)} процессов бота")
+    for pid in pids:
+        print(f"   Останавливаю PID {pid}...")
+        try:
+            os.kill(pid, signal.SIGKILL)
+        except OSError:
+            pass
+
+
 def kill_python_processes():
     """Kill all Python processes that might be running the bot."""
     print("🔍 Поиск запущенных Python процессов...")
     
+    # psutil (optional) scans processes on any OS without subprocesses
+    try:
+        import psutil
+    except ImportError:
+        psutil = None
+    
+    if psutil is not None:
+        _kill_with_psutil(psutil)
+    elif os.path.isdir('/proc'):
+        _kill_with_procfs()
     # Windows
-    if os.name == 'nt':
+    elif os.name == 'nt':
         # Find Python processes
-        code, stdout, stderr = run_command('tasklist /fi "imagename eq python.exe" /fo csv')
+        code, stdout, stderr = run_command(['tasklist', '/fi', 'imagename eq python.exe', '/fo', 'csv'])
         if code == 0 and stdout:
             lines = stdout.strip().split('\n')[1:]  # Skip header
             pids = []
@@ -41,20 +138,23 @@ def kill_python_processes():
                 print(f"📍 Найдено {len(pids)} Python процессов: {', '.join(pids)}")
                 for pid in pids:
                     print(f"   Останавливаю PID {pid}...")
-                    run_command(f'taskkill /F /PID {pid}')
+                    run_command(['taskkill', '/F', '/PID', pid])
             else:
                 print("✅ Активных Python процессов не найдено")
     else:
         # Linux/Unix
-        code, stdout, stderr = run_command("ps aux | grep python")
+        code, stdout, stderr = run_command(['ps', 'aux'])
         if code == 0:
-            processes = [line for line in stdout.split('\n') if 'app.main' in line or 'schedulebot' in line]
+            processes = [
+                line for line in stdout.split('\n')
+                if 'python' in line and ('app.main' in line or 'schedulebot' in line)
+            ]
             if processes:
                 print(f"📍 Найдено {len(processes)} процессов бота")
                 for process in processes:
                     pid = process.split()[1]
                     print(f"   Останавливаю PID {pid}...")
-                    run_command(f"kill -9 {pid}")
+                    run_command(['kill', '-9', pid])
             else:
                 print("✅ Активных процессов бота не найдено")
 
@@ -66,65 +166,49 @@ def check_ports():
     ports_to_check = [8000, 5000, 3000]
     
     for port in ports_to_check:
-        if os.name == 'nt':
-            code, stdout, stderr = run_command(f'netstat -ano | findstr ":{port}"')
-        else:
-            code, stdout, stderr = run_command(f"lsof -i :{port}")
+        # A successful connect means something is listening; no netstat/lsof
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            sock.settimeout(1)
+            occupied = sock.connect_ex(('127.0.0.1', port)) == 0
         
-        if code == 0 and stdout.strip():
-            print(f"⚠️  Порт {port} занят:")
-            for line in stdout.strip().split('\n'):
-                print(f"     {line}")
+        if occupied:
+            print(f"⚠️  Порт {port} занят")
         else:
             print(f"✅ Порт {port} свободен")
 
 
-def clear_telegram_webhook():
+async def clear_telegram_webhook():
     """Clear Telegram webhook if set."""
     print("\n🧹 Очистка Telegram webhook...")
     
-    # Try to get bot token from environment or config
-    bot_token = None
-    
-    # Check environment variable
-    bot_token = os.environ.get('BOT_TOKEN')
-    
-    # Try to read from config if available
-    if not bot_token:
+    if BOT_TOKEN:
+        base_url = f"https://api.telegram.org/bot{BOT_TOKEN}"
         try:
-            sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
-            from app.config import settings
-            bot_token = settings.BOT_TOKEN
-        except:
-            pass
-    
-    if bot_token:
-        import requests
-        try:
-            # Delete webhook
-            url = f"https://api.telegram.org/bot{bot_token}/deleteWebhook"
-            response = requests.get(url, timeout=10)
-            if response.status_code == 200:
-                data = response.json()
-                if data.get('ok'):
-                    print("✅ Webhook удален")
+            # One client: both calls reuse the same TLS connection. The status
+            # check must see the deletion, so the calls stay sequential.
+            async with httpx.AsyncClient(base_url=base_url, timeout=10) as client:
+                # Delete webhook
+                response = await client.get("/deleteWebhook")
+                if response.status_code == 200:
+                    data = response.json()
+                    if data.get('ok'):
+                        print("✅ Webhook удален")
+                    else:
+                        print(f"⚠️  Ошибка удаления webhook: {data.get('description', 'Неизвестная ошибка')}")
                 else:
-                    print(f"⚠️  Ошибка удаления webhook: {data.get('description', 'Неизвестная ошибка')}")
-            else:
-                print(f"⚠️  HTTP {response.status_code} при удалении webhook")
+                    print(f"⚠️  HTTP {response.status_code} при удалении webhook")
                 
-            # Check webhook status
-            url = f"https://api.telegram.org/bot{bot_token}/getWebhookInfo"
-            response = requests.get(url, timeout=10)
-            if response.status_code == 200:
-                data = response.json()
-                if data.get('ok'):
-                    webhook_info = data.get('result', {})
-                    webhook_url = webhook_info.get('url', '')
-                    if webhook_url:
-                        print(f"⚠️  Webhook все еще установлен: {webhook_url}")
-                    else:
-                        print("✅ Webhook не установлен")
+                # Check webhook status
+                response = await client.get("/getWebhookInfo")
+                if response.status_code == 200:
+                    data = response.json()
+                    if data.get('ok'):
+                        webhook_info = data.get('result', {})
+                        webhook_url = webhook_info.get('url', '')
+                        if webhook_url:
+                            print(f"⚠️  Webhook все еще установлен: {webhook_url}")
+                        else:
+                            print("✅ Webhook не установлен")
             
         except Exception as e:
             print(f"❌ Ошибка при работе с webhook: {e}")
@@ -140,7 +224,7 @@ def main():
     
     kill_python_processes()
     check_ports()
-    clear_telegram_webhook()
+    asyncio.run(clear_telegram_webhook())
     
     print("\n" + "=" * 60)
     print("✅ Очистка завершена!")
@@ -2,16 +2,37 @@
 """Admin panel API test script."""
 import requests
 import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from requests.adapters import HTTPAdapter
 
 BASE_URL = "http://127.0.0.1:8000"
 
+# Concurrent read-only checks (and pooled connections for them)
+PARALLEL_REQUESTS = 8
+
+# (label, title, path, expected status, success message)
+READ_ONLY_CHECKS = [
+    ("3️⃣", "dashboard", "/admin/dashboard", 200, "Dashboard: 200 OK"),
+    ("4️⃣", "directions list", "/admin/directions", 200, "Directions list: 200 OK"),
+    ("5️⃣", "pairs list", "/admin/pairs", 200, "Pairs list: 200 OK"),
+    ("6️⃣", "time slots", "/admin/slots", 200, "Time slots: 200 OK"),
+    ("7️⃣", "broadcast page", "/admin/broadcast", 200, "Broadcast page: 200 OK"),
+    ("8️⃣", "logs page", "/admin/logs", 200, "Logs page: 200 OK"),
+    ("9️⃣", "new pair form", "/admin/pairs/new", 200, "New pair form: 200 OK"),
+    ("🔟", "new direction form", "/admin/directions/new", 200, "New direction form: 200 OK"),
+    ("1️⃣1️⃣", "404 page", "/nonexistent-page", 404, "404 page: 404 Not Found (correct)"),
+]
+
 def test_admin_panel():
     """Test admin panel endpoints."""
     print("🔐 Testing Admin Panel")
     print("=" * 50)
     
-    # Create session
+    # Create session; requests reuse pooled keep-alive connections
     session = requests.Session()
+    session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=PARALLEL_REQUESTS))
+    session.headers["Connection"] = "keep-alive"
     
     # Test 1: Login page
     print("\n1️⃣ Testing login page...")
@@ -26,60 +47,19 @@ def test_admin_panel():
     assert "dashboard" in r.url or "Дашборд" in r.text or "Статистика" in r.text, "Login did not redirect to dashboard"
     print("   ✅ Login successful")
     
-    # Test 3: Dashboard
-    print("\n3️⃣ Testing dashboard...")
-    r = session.get(f"{BASE_URL}/admin/dashboard")
-    assert r.status_code == 200, f"Dashboard failed: {r.status_code}"
-    print("   ✅ Dashboard: 200 OK")
-    
-    # Test 4: Directions list
-    print("\n4️⃣ Testing directions list...")
-    r = session.get(f"{BASE_URL}/admin/directions")
-    assert r.status_code == 200, f"Directions failed: {r.status_code}"
-    assert "Направления" in r.text or "directions" in r.text.lower()
-    print("   ✅ Directions list: 200 OK")
-    
-    # Test 5: Pairs list
-    print("\n5️⃣ Testing pairs list...")
-    r = session.get(f"{BASE_URL}/admin/pairs")
-    assert r.status_code == 200, f"Pairs failed: {r.status_code}"
-    print("   ✅ Pairs list: 200 OK")
-    
-    # Test 6: Time slots
-    print("\n6️⃣ Testing time slots...")
-    r = session.get(f"{BASE_URL}/admin/slots")
-    assert r.status_code == 200, f"Slots failed: {r.status_code}"
-    print("   ✅ Time slots: 200 OK")
-    
-    # Test 7: Broadcast page
-    print("\n7️⃣ Testing broadcast page...")
-    r = session.get(f"{BASE_URL}/admin/broadcast")
-    assert r.status_code == 200, f"Broadcast failed: {r.status_code}"
-    print("   ✅ Broadcast page: 200 OK")
-    
-    # Test 8: Logs page
-    print("\n8️⃣ Testing logs page...")
-    r = session.get(f"{BASE_URL}/admin/logs")
-    assert r.status_code == 200, f"Logs failed: {r.status_code}"
-    print("   ✅ Logs page: 200 OK")
-    
-    # Test 9: New pair form
-    print("\n9️⃣ Testing new pair form...")
-    r = session.get(f"{BASE_URL}/admin/pairs/new")
-    assert r.status_code == 200, f"New pair failed: {r.status_code}"
-    print("   ✅ New pair form: 200 OK")
-    
-    # Test 10: New direction form
-    print("\n🔟 Testing new direction form...")
-    r = session.get(f"{BASE_URL}/admin/directions/new")
-    assert r.status_code == 200, f"New direction failed: {r.status_code}"
-    print("   ✅ New direction form: 200 OK")
+    # Tests 3-11 are independent read-only GETs: run them concurrently,
+    # then check and report in order
+    with ThreadPoolExecutor(max_workers=PARALLEL_REQUESTS) as executor:
+        responses = list(executor.map(
+            lambda check: session.get(f"{BASE_URL}{check[2]}"), READ_ONLY_CHECKS
+        ))
     
-    # Test 11: 404 page
-    print("\n1️⃣1️⃣ Testing 404 page...")
-    r = session.get(f"{BASE_URL}/nonexistent-page")
-    assert r.status_code == 404, f"Expected 404, got: {r.status_code}"
-    print("   ✅ 404 page: 404 Not Found (correct)")
+    for (label, title, path, expected, ok_message), r in zip(READ_ONLY_CHECKS, responses):
+        print(f"\n{label} Testing {title}...")
+        assert r.status_code == expected, f"{title} failed: {r.status_code}"
+        if path == "/admin/directions":
+            assert "Направления" in r.text or "directions" in r.text.lower()
+        print(f"   ✅ {ok_message}")
     
     # Test 12: Logout
     print("\n1️⃣2️⃣ Testing logout...")
@@ -7,11 +7,21 @@ DB_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'schedule.db')
 
 def update_database():
     """Update database with correct time slots and new tables."""
-    conn = sqlite3.connect(DB_PATH)
+    # Autocommit mode: the transaction below is managed explicitly
+    conn = sqlite3.connect(DB_PATH, isolation_level=None)
     cursor = conn.cursor()
     
     print("🔄 Updating database...")
     
+    # Same pragmas the app uses; then every change, DDL included, goes
+    # into one transaction with a single commit
+    cursor.executescript(
+        "PRAGMA journal_mode = WAL;"
+        "PRAGMA synchronous = NORMAL;"
+        "PRAGMA temp_store = MEMORY;"
+    )
+    cursor.execute("BEGIN IMMEDIATE")
+    
     # 1. Update time slots to correct AGU times
     print("\n📅 Updating time slots...")
     time_slots = [
@@ -22,15 +32,21 @@ def update_database():
         (5, '16:30', '18:05'),
     ]
     
+    # All slots in one statement: CASE picks each slot's new times
+    cases = " ".join(["WHEN ? THEN ?"] * len(time_slots))
+    slot_list = ", ".join(["?"] * len(time_slots))
+    start_params = [v for slot_number, start_time, _ in time_slots for v in (slot_number, start_time)]
+    end_params = [v for slot_number, _, end_time in time_slots for v in (slot_number, end_time)]
+    cursor.execute(
+        f"""
+        UPDATE time_slots 
+        SET start_time = CASE slot_number {cases} END,
+            end_time = CASE slot_number {cases} END
+        WHERE slot_number IN ({slot_list})
+        """,
+        start_params + end_params + [slot[0] for slot in time_slots]
+    )
     for slot_number, start_time, end_time in time_slots:
-        cursor.execute(
-            """
-            UPDATE time_slots 
-            SET start_time = ?, end_time = ?
-            WHERE slot_number = ?
-            """,
-            (start_time, end_time, slot_number)
-        )
         print(f"  Пара {slot_number}: {start_time} - {end_time}")
     
     # 2. Create subjects table for autocomplete
@@ -42,7 +58,6 @@ def update_database():
             created_at TEXT NOT NULL DEFAULT (datetime('now'))
         )
     """)
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_subjects_name ON subjects(name)")
     
     # 3. Create teachers table for autocomplete
     print("👨‍🏫 Creating teachers table...")
@@ -53,30 +68,28 @@ def update_database():
             created_at TEXT NOT NULL DEFAULT (datetime('now'))
         )
     """)
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_teachers_name ON teachers(name)")
     
     # 4. Populate subjects and teachers from existing pairs
     print("\n📝 Populating autocomplete data from existing pairs...")
     
-    cursor.execute("SELECT DISTINCT title FROM pairs WHERE title IS NOT NULL")
-    subjects = cursor.fetchall()
-    for (subject,) in subjects:
-        try:
-            cursor.execute("INSERT OR IGNORE INTO subjects (name) VALUES (?)", (subject,))
-        except:
-            pass
-    print(f"  Added {len(subjects)} subjects")
+    # Copied inside SQLite; rowcount is the number of rows actually inserted
+    cursor.execute(
+        "INSERT OR IGNORE INTO subjects (name) "
+        "SELECT DISTINCT title FROM pairs WHERE title IS NOT NULL"
+    )
+    print(f"  Added {cursor.rowcount} subjects")
     
-    cursor.execute("SELECT DISTINCT teacher FROM pairs WHERE teacher IS NOT NULL")
-    teachers = cursor.fetchall()
-    for (teacher,) in teachers:
-        try:
-            cursor.execute("INSERT OR IGNORE INTO teachers (name) VALUES (?)", (teacher,))
-        except:
-            pass
-    print(f"  Added {len(teachers)} teachers")
+    cursor.execute(
+        "INSERT OR IGNORE INTO teachers (name) "
+        "SELECT DISTINCT teacher FROM pairs WHERE teacher IS NOT NULL"
+    )
+    print(f"  Added {cursor.rowcount} teachers")
+    
+    # Indexes built once over the loaded rows instead of per insert
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_subjects_name ON subjects(name)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_teachers_name ON teachers(name)")
     
-    conn.commit()
+    cursor.execute("COMMIT")
     conn.close()
     
     print("\n✅ Database updated successfully!")
@@ -0,0 +1,42 @@
+"""
+Shared pytest setup.
+
+Settings are validated on import of the app package, so the required
+environment is filled in here before any test module imports it.
+"""
+
+import os
+import sqlite3
+import tempfile
+from pathlib import Path
+
+import pytest
+
+_TMP_DIR = tempfile.mkdtemp(prefix='schedulebot-tests-')
+
+os.environ.setdefault('BOT_TOKEN', '123456:test-token')
+os.environ.setdefault('ADMIN_TG_ID', '1')
+os.environ.setdefault('ADMIN_PASSWORD', 'test-password')
+os.environ.setdefault('SECRET_KEY', 'test-secret-key-with-at-least-32-chars')
+os.environ.setdefault('DATABASE_PATH', os.path.join(_TMP_DIR, 'schedule.db'))
+os.environ.setdefault('LOG_FILE_PATH', os.path.join(_TMP_DIR, 'app.log'))
+os.environ.pop('DATABASE_URL', None)
+
+SQL_DIR = Path(__file__).resolve().parent.parent / 'app' / 'db'
+
+
+@pytest.fixture
+def database(tmp_path, monkeypatch):
+    """Fresh SQLite database with schema and seed data, set as DATABASE_PATH."""
+    from app.config import settings
+    
+    db_path = tmp_path / 'schedule.db'
+    monkeypatch.setattr(settings, 'DATABASE_PATH', str(db_path))
+    
+    db = sqlite3.connect(db_path)
+    db.executescript((SQL_DIR / 'schema.sql').read_text(encoding='utf-8'))
+    db.executescript((SQL_DIR / 'seed.sql').read_text(encoding='utf-8'))
+    db.commit()
+    db.close()
+    
+    return db_path
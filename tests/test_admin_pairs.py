@@ -0,0 +1,77 @@
+"""
+Admin pair pages against SQLite while the bot runs in PostgreSQL mode.
+
+The admin panel always talks to the local SQLite database, so queries it
+uses must emit SQLite SQL even when the PostgreSQL backend is selected.
+"""
+
+import asyncio
+import sqlite3
+from pathlib import Path
+
+import aiosqlite
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import app.db.connection_cloud as connection_cloud
+from app.admin.auth import get_current_session
+from app.admin.pairs import router
+from app.config import settings
+from app.db.queries.pairs import get_pair_with_directions
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture
+def pair_id(database):
+    """Add one pair assigned to two directions to the test database."""
+    db = sqlite3.connect(database)
+    cursor = db.execute(
+        "INSERT INTO pairs (title, teacher, room, type, day_of_week, time_slot_id) "
+        "VALUES ('Математика', 'Иванов И.И.', '101', 'Лекция', 0, 1)"
+    )
+    new_id = cursor.lastrowid
+    db.executemany(
+        "INSERT INTO pair_assignments (pair_id, direction_id) VALUES (?, ?)",
+        [(new_id, 1), (new_id, 2)]
+    )
+    db.commit()
+    db.close()
+    
+    return new_id
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """Admin pairs router with authentication bypassed, in PostgreSQL mode."""
+    monkeypatch.chdir(REPO_ROOT)
+    monkeypatch.setattr(connection_cloud, '_USE_POSTGRES', True)
+    
+    admin = FastAPI()
+    admin.include_router(router)
+    admin.dependency_overrides[get_current_session] = lambda: {'username': 'admin'}
+    
+    with TestClient(admin) as test_client:
+        yield test_client
+
+
+def test_pair_edit_form_in_postgres_mode(client, pair_id):
+    response = client.get(f'/admin/pairs/{pair_id}/edit', follow_redirects=False)
+    
+    assert response.status_code == 200
+    assert 'Математика' in response.text
+
+
+def test_pair_directions_use_sqlite_aggregate(pair_id, monkeypatch):
+    monkeypatch.setattr(connection_cloud, '_USE_POSTGRES', True)
+    
+    async def load():
+        async with aiosqlite.connect(settings.DATABASE_PATH) as conn:
+            conn.row_factory = aiosqlite.Row
+            return await get_pair_with_directions(conn, pair_id)
+    
+    pair, direction_ids = asyncio.run(load())
+    
+    assert pair.title == 'Математика'
+    assert sorted(direction_ids) == [1, 2]
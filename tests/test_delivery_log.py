@@ -0,0 +1,67 @@
+"""
+DeliveryLogBuffer: entries of a job are written in one flush.
+"""
+
+import asyncio
+import sqlite3
+
+from app.db.connection import get_connection
+from app.scheduler.utils import DeliveryLogBuffer
+
+
+def flush(delivery_log):
+    """Flush the buffer on a new connection to the test database."""
+    async def main():
+        conn = await get_connection()
+        try:
+            await delivery_log.flush(conn)
+        finally:
+            await conn.close()
+    
+    asyncio.run(main())
+
+
+def logged_rows(database):
+    """Committed delivery_log rows, read on a separate connection."""
+    db = sqlite3.connect(database)
+    try:
+        return db.execute(
+            "SELECT user_id, message_type, status, error_message "
+            "FROM delivery_log ORDER BY id"
+        ).fetchall()
+    finally:
+        db.close()
+
+
+def test_flush_writes_and_clears_entries(database):
+    delivery_log = DeliveryLogBuffer()
+    delivery_log.add(1001, 'morning', 'sent')
+    delivery_log.add(1002, 'morning', 'error', 'Failed after retries')
+    assert len(delivery_log) == 2
+    
+    flush(delivery_log)
+    
+    assert logged_rows(database) == [
+        (1001, 'morning', 'sent', None),
+        (1002, 'morning', 'error', 'Failed after retries'),
+    ]
+    assert not delivery_log
+
+
+def test_flush_of_empty_buffer_writes_nothing(database):
+    flush(DeliveryLogBuffer())
+    
+    assert logged_rows(database) == []
+
+
+def test_failed_flush_keeps_entries(database):
+    db = sqlite3.connect(database)
+    db.execute("DROP TABLE delivery_log")
+    db.commit()
+    db.close()
+    
+    delivery_log = DeliveryLogBuffer()
+    delivery_log.add(1001, 'reminder', 'sent')
+    flush(delivery_log)
+    
+    assert len(delivery_log) == 1
@@ -0,0 +1,101 @@
+"""
+SQLite connection pool: reader growth, the writer lock and rollback.
+"""
+
+import asyncio
+
+import pytest
+
+from app.db.pool import AsyncDatabasePool
+
+
+def run_with_pool(database, test, min_readers=1, max_readers=2):
+    """Run test(pool) on a fresh pool over the test database, then close it."""
+    async def main():
+        pool = AsyncDatabasePool(str(database), min_readers=min_readers, max_readers=max_readers)
+        try:
+            return await test(pool)
+        finally:
+            await pool.close()
+    
+    return asyncio.run(main())
+
+
+def test_readers_grow_when_all_are_busy(database):
+    async def test(pool):
+        async with pool.acquire(read_only=True) as first:
+            async with pool.acquire(read_only=True) as second:
+                assert first is not second
+                return len(pool._all_readers)
+    
+    assert run_with_pool(database, test, min_readers=1, max_readers=2) == 2
+
+
+def test_concurrent_growth_stays_within_max_readers(database):
+    async def test(pool):
+        release = asyncio.Event()
+        
+        async def hold_reader():
+            async with pool.acquire(read_only=True):
+                await release.wait()
+        
+        tasks = [asyncio.create_task(hold_reader()) for _ in range(6)]
+        # Let every task try to grow the pool before any reader is returned
+        await asyncio.sleep(0.2)
+        opened = len(pool._all_readers)
+        slots = pool._reader_slots
+        release.set()
+        await asyncio.gather(*tasks)
+        return opened, slots
+    
+    assert run_with_pool(database, test, min_readers=1, max_readers=3) == (3, 3)
+
+
+def test_reader_slot_is_released_when_connect_fails(database, monkeypatch):
+    async def test(pool):
+        await pool.open()
+        
+        async def fail():
+            raise OSError("connect failed")
+        
+        monkeypatch.setattr(pool, '_open_reader', fail)
+        with pytest.raises(OSError):
+            await pool._grow_readers()
+        return pool._reader_slots
+    
+    assert run_with_pool(database, test, min_readers=1, max_readers=2) == 1
+
+
+def test_writer_is_held_by_one_block_at_a_time(database):
+    async def test(pool):
+        async def second_writer():
+            async with pool.acquire():
+                pass
+        
+        async with pool.acquire():
+            # The lock is not reentrant: a second writer, even from this
+            # task, waits until the first block ends
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(second_writer(), 0.1)
+        
+        async with pool.acquire() as conn:
+            return conn is pool._writer
+    
+    assert run_with_pool(database, test)
+
+
+def test_writer_rolls_back_on_error(database):
+    async def test(pool):
+        with pytest.raises(RuntimeError):
+            async with pool.acquire() as conn:
+                await conn.execute(
+                    "INSERT INTO subjects (name) VALUES ('Физика')"
+                )
+                raise RuntimeError("failed halfway")
+        
+        async with pool.acquire(read_only=True) as conn:
+            cursor = await conn.execute("SELECT COUNT(*) FROM subjects WHERE name = 'Физика'")
+            count = (await cursor.fetchone())[0]
+        return count, pool._writer.in_transaction
+    
+    assert run_with_pool(database, test) == (0, False)
@@ -0,0 +1,54 @@
+"""
+RateLimiter: calls are spaced so no window of `period` exceeds `rate`.
+"""
+
+import asyncio
+
+from app.scheduler.utils import RateLimiter
+
+# Allowance for event loop wake-up jitter
+TOLERANCE = 0.01
+
+
+def start_times(limiter, calls):
+    """Loop times at which `calls` concurrent acquisitions were let through."""
+    async def main():
+        loop = asyncio.get_running_loop()
+        times = []
+        
+        async def call():
+            async with limiter:
+                times.append(loop.time())
+        
+        await asyncio.gather(*(call() for _ in range(calls)))
+        return times
+    
+    return asyncio.run(main())
+
+
+def test_no_period_window_exceeds_rate():
+    rate, period = 10, 0.2
+    times = start_times(RateLimiter(rate, period), 3 * rate)
+    
+    # The (rate + 1)-th call after any call starts a full period later
+    for first, later in zip(times, times[rate:]):
+        assert later - first >= period - TOLERANCE
+
+
+def test_calls_are_spaced_evenly():
+    rate, period = 10, 0.2
+    times = start_times(RateLimiter(rate, period), rate)
+    
+    for previous, current in zip(times, times[1:]):
+        assert current - previous >= period / rate - TOLERANCE
+
+
+def test_first_call_is_not_delayed():
+    async def main():
+        limiter = RateLimiter(1, 10)
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        await limiter.acquire()
+        return loop.time() - started
+    
+    assert asyncio.run(main()) < TOLERANCE
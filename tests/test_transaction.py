@@ -0,0 +1,95 @@
+"""
+transaction() on SQLite connections: commit, rollback and nesting.
+"""
+
+import asyncio
+import sqlite3
+
+import pytest
+
+from app.db import transaction
+from app.db.connection import get_connection
+
+
+def count_subjects(database):
+    """Committed rows in subjects, read on a separate connection."""
+    db = sqlite3.connect(database)
+    try:
+        return db.execute("SELECT COUNT(*) FROM subjects").fetchone()[0]
+    finally:
+        db.close()
+
+
+def run_on_connection(test):
+    """Run test(conn) on a new connection to the test database."""
+    async def main():
+        conn = await get_connection()
+        try:
+            return await test(conn)
+        finally:
+            await conn.close()
+    
+    return asyncio.run(main())
+
+
+def test_commits_on_exit(database):
+    async def test(conn):
+        async with transaction(conn):
+            await conn.execute("INSERT INTO subjects (name) VALUES ('Алгебра')")
+            await conn.execute("INSERT INTO subjects (name) VALUES ('Геометрия')")
+        return conn.in_transaction
+    
+    assert run_on_connection(test) is False
+    assert count_subjects(database) == 2
+
+
+def test_rolls_back_on_error(database):
+    async def test(conn):
+        with pytest.raises(RuntimeError):
+            async with transaction(conn):
+                await conn.execute("INSERT INTO subjects (name) VALUES ('Алгебра')")
+                raise RuntimeError("failed halfway")
+        return conn.in_transaction
+    
+    assert run_on_connection(test) is False
+    assert count_subjects(database) == 0
+
+
+def test_nested_block_leaves_commit_to_outer(database):
+    async def test(conn):
+        async with transaction(conn):
+            async with transaction(conn):
+                await conn.execute("INSERT INTO subjects (name) VALUES ('Алгебра')")
+            # Inner exit must not commit
+            assert count_subjects(database) == 0
+            await conn.execute("INSERT INTO subjects (name) VALUES ('Геометрия')")
+        return conn._transaction_depth
+    
+    assert run_on_connection(test) == 0
+    assert count_subjects(database) == 2
+
+
+def test_error_in_nested_block_rolls_back_outer(database):
+    async def test(conn):
+        with pytest.raises(RuntimeError):
+            async with transaction(conn):
+                await conn.execute("INSERT INTO subjects (name) VALUES ('Алгебра')")
+                async with transaction(conn):
+                    raise RuntimeError("failed halfway")
+        return conn._transaction_depth
+    
+    assert run_on_connection(test) == 0
+    assert count_subjects(database) == 0
+
+
+def test_does_not_join_transaction_opened_elsewhere(database):
+    async def test(conn):
+        await conn.execute("INSERT INTO subjects (name) VALUES ('Алгебра')")
+        assert conn.in_transaction
+        with pytest.raises(sqlite3.OperationalError):
+            async with transaction(conn):
+                pass
+        await conn.rollback()
+    
+    run_on_connection(test)
+    assert count_subjects(database) == 0
@@ -0,0 +1,76 @@
+"""
+async_ttl_cache: caching, coalescing of cold calls and invalidation.
+"""
+
+import asyncio
+
+from app.cache.ttl import async_ttl_cache
+
+
+def make_counter(ttl=60.0, delay=0.0):
+    """Cached function returning how many times it has actually run."""
+    calls = 0
+    
+    @async_ttl_cache(ttl)
+    async def load():
+        nonlocal calls
+        calls += 1
+        result = calls
+        await asyncio.sleep(delay)
+        return result
+    
+    return load
+
+
+def test_result_is_cached_until_ttl_expires():
+    load = make_counter(ttl=0.05)
+    
+    async def main():
+        first = await load()
+        second = await load()
+        await asyncio.sleep(0.1)
+        return first, second, await load()
+    
+    assert asyncio.run(main()) == (1, 1, 2)
+
+
+def test_concurrent_cold_calls_share_one_load():
+    load = make_counter(delay=0.05)
+    
+    async def main():
+        return await asyncio.gather(*(load() for _ in range(5)))
+    
+    assert asyncio.run(main()) == [1] * 5
+
+
+def test_cache_clear_forces_reload():
+    load = make_counter()
+    
+    async def main():
+        await load()
+        load.cache_clear()
+        return await load()
+    
+    assert asyncio.run(main()) == 2
+
+
+def test_load_overlapping_cache_clear_is_not_stored():
+    load = make_counter(delay=0.05)
+    
+    async def main():
+        in_flight = asyncio.create_task(load())
+        await asyncio.sleep(0.01)
+        # A write lands while the first load is still running
+        load.cache_clear()
+        return await in_flight, await load()
+    
+    # The stale result goes to its caller but isn't served afterwards
+    assert asyncio.run(main()) == (1, 2)
+
+
+def test_can_be_used_from_several_event_loops():
+    load = make_counter(ttl=0.0)
+    
+    results = [asyncio.run(load()) for _ in range(2)]
+    
+    assert results == [1, 2]